@@ -1,39 +1,127 @@
 import argparse
 
 
+import json
+
+
 from pathlib import Path
 
 
-from src.data.ingest import ensure_srag_csv
+def run_pipeline(
+    csv_path: str | None = None,
+    use_cache: bool | None = None,
+    chunksize: int | None = None,
+    engine: str = "pandas",
+    all_files: bool = False,
+    incremental: bool | None = None,
+    strata: list[str] | None = None,
+    chart_backend: str | None = None,
+) -> Path:
+    # Os módulos do pipeline (pandas, duckdb, matplotlib, jinja2, feedparser)
+    # só carregam ao gerar o relatório; `--help` e `import` ficam leves.
+    from src.data.ingest import discover_srag_csvs, ensure_srag_csv
+
+    from src.data.clean import load_and_clean_many, load_and_clean_srag
+
+    from src.data.quality import quality_profile
+
+    from src.data.duckdb_engine import run_duckdb_engine
+
+    from src.report.delay import build_delay_matrix, completeness_adjusted_metrics
+
+    from src.report.aggregates import build_daily_cube
+
+    from src.report.metrics_cache import cached_metrics_from_cube
+
+    from src.report.charts import daily_chart_jobs, render_chart_jobs, weekly_chart_job
+
+    from src.report.metrics import compute_weekly_metrics, weekly_summary
+
+    from src.report.strata import (
+        check_stratified_guardrails,
+        compute_stratified_metrics,
+        stratified_records,
+    )
+
+    from src.agent.orchestrator import generate_narrative
+
+    from src.report.writer import write_markdown_report, write_quality_profile
 
+    if all_files:
+        sources = discover_srag_csvs()
 
-from src.data.clean import load_and_clean_srag
+    else:
+        sources = [ensure_srag_csv(csv_path)]
 
+    if strata and engine == "duckdb":
+        raise ValueError("Métricas estratificadas (--strata) requerem o motor pandas")
 
-from src.report.metrics import compute_core_metrics
+    strata_records = None
 
+    profile = None
 
-from src.report.charts import generate_charts
+    if engine == "duckdb":
+        metrics, cube = run_duckdb_engine(sources)
 
+    else:
+        if len(sources) > 1:
+            df = load_and_clean_many(
+                sources,
+                use_cache=use_cache,
+                chunksize=chunksize,
+                incremental=incremental,
+            )
 
-from src.agent.orchestrator import generate_narrative
+        else:
+            df = load_and_clean_srag(
+                sources[0],
+                use_cache=use_cache,
+                chunksize=chunksize,
+                incremental=incremental,
+            )
 
+        profile = quality_profile(df)
 
-from src.report.writer import write_markdown_report
+        # Um único agregado diário alimenta métricas e gráficos.
+        cube = build_daily_cube(df)
 
+        metrics = cached_metrics_from_cube(cube, use_cache=use_cache)
 
-def run_pipeline(csv_path: str | None = None) -> Path:
-    raw_csv = ensure_srag_csv(csv_path)
+        # Contagens recentes ajustadas pelo atraso de notificação.
+        metrics = {
+            **metrics,
+            **completeness_adjusted_metrics(cube, build_delay_matrix(df)),
+        }
 
-    df = load_and_clean_srag(raw_csv)
+        if strata:
+            strata_records = stratified_records(compute_stratified_metrics(df, strata))
 
-    metrics = compute_core_metrics(df)
+            check_stratified_guardrails(strata_records)
 
-    daily_png, monthly_png = generate_charts(df)
+    # Série por semana epidemiológica, do mesmo cubo diário.
+    weekly = compute_weekly_metrics(cube)
+
+    # Cada gráfico é um job independente, renderizados em paralelo.
+    chart_paths = render_chart_jobs(
+        [
+            *daily_chart_jobs(cube["cases"], chart_backend),
+            weekly_chart_job(weekly, backend=chart_backend),
+        ],
+        use_cache=use_cache,
+    )
 
     narrative = generate_narrative(metrics)
 
-    report_path = write_markdown_report(metrics, narrative, [daily_png, monthly_png])
+    report_path = write_markdown_report(
+        metrics,
+        narrative,
+        chart_paths,
+        strata=strata_records,
+        weekly=weekly_summary(weekly),
+    )
+
+    if profile:
+        write_quality_profile(profile, report_path)
 
     return report_path
 
@@ -41,15 +129,108 @@ def run_pipeline(csv_path: str | None = None) -> Path:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Gerador de relatório de SRAG")
 
-    parser.add_argument(
+    sources = parser.add_mutually_exclusive_group()
+
+    sources.add_argument(
         "--csv",
         type=str,
         default=None,
-        help="Caminho opcional para o CSV de SRAG (se omitido, procura em data/raw)",
+        help=(
+            "Caminho opcional para o CSV de SRAG (.csv, .csv.gz, .csv.zst "
+            "ou .zip; se omitido, procura em data/raw)"
+        ),
+    )
+
+    sources.add_argument(
+        "--all-files",
+        action="store_true",
+        help="Usa todos os CSVs anuais de dados/brutos e data/raw, limpos em paralelo",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Ignora os caches (dados limpos em Parquet, métricas e gráficos) "
+            "e relê o CSV"
+        ),
+    )
+
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Lê e limpa o CSV em blocos com este número de linhas (limita a memória)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Limpa só as linhas acrescentadas ao CSV desde a última execução",
+    )
+
+    parser.add_argument(
+        "--strata",
+        type=str,
+        default=None,
+        help=(
+            "Métricas por estrato, separados por vírgula "
+            "(sg_uf_not, co_mun_not, age_band)"
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics-only",
+        action="store_true",
+        help=(
+            "Só imprime as métricas (JSON), lidas do CSV em fluxo sem montar "
+            "o DataFrame nem o relatório"
+        ),
+    )
+
+    parser.add_argument(
+        "--chart-backend",
+        choices=["png", "svg"],
+        default=None,
+        help=(
+            "Formato dos gráficos (svg não carrega matplotlib/seaborn; "
+            "padrão: CHART_BACKEND)"
+        ),
+    )
+
+    parser.add_argument(
+        "--engine",
+        choices=["pandas", "duckdb"],
+        default="pandas",
+        help="Motor de limpeza e métricas (duckdb processa o arquivo direto em SQL)",
     )
 
     args = parser.parse_args()
 
-    path = run_pipeline(args.csv)
+    if args.metrics_only:
+        from src.data.ingest import discover_srag_csvs, ensure_srag_csv
+
+        from src.data.streaming import stream_core_metrics
+
+        paths = discover_srag_csvs() if args.all_files else [ensure_srag_csv(args.csv)]
+
+        metrics = stream_core_metrics(paths, chunksize=args.chunksize)
+
+        print(json.dumps(metrics, ensure_ascii=False, indent=2))
+
+        raise SystemExit(0)
+
+    path = run_pipeline(
+        args.csv,
+        use_cache=False if args.no_cache else None,
+        chunksize=args.chunksize,
+        engine=args.engine,
+        all_files=args.all_files,
+        incremental=True if args.incremental else None,
+        strata=[s.strip() for s in args.strata.split(",") if s.strip()]
+        if args.strata
+        else None,
+        chart_backend=args.chart_backend,
+    )
 
     print(f"Relatório salvo em: {path}")
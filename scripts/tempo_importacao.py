@@ -0,0 +1,96 @@
+"""Mede o tempo de importação dos pontos de entrada com `python -X importtime`.
+
+Uso: python scripts/tempo_importacao.py [modulo ...] [--top N]
+
+Cada módulo é importado num processo novo (com GOVERNANCE_ENABLED=0). O
+script falha se a importação passar do orçamento ou carregar alguma das
+dependências pesadas, que só devem ser importadas no primeiro uso.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Dependências que os pontos de entrada não podem importar de início.
+HEAVY_MODULES = [
+    "pandas",
+    "numpy",
+    "pyarrow",
+    "duckdb",
+    "matplotlib",
+    "seaborn",
+    "jinja2",
+    "feedparser",
+    "boto3",
+    "botocore",
+]
+
+# Orçamento (ms, tempo acumulado do módulo) por ponto de entrada; folgado
+# para máquinas lentas, mas bem abaixo dos ~250 ms de importar o pandas.
+IMPORT_BUDGET_MS = {
+    "main": 100,
+    "principal": 100,
+    "src.governance": 100,
+}
+
+
+def measure_imports(module: str) -> Dict[str, int]:
+    """Importa `module` num processo novo e retorna módulo -> µs acumulados."""
+    env = {**os.environ, "GOVERNANCE_ENABLED": "0"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # O que o `site` carrega (arquivos .pth etc.) não conta para o módulo.
+        if name == " site":
+            timings = {}
+            continue
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def heavy_imports(timings: Dict[str, int]) -> List[str]:
+    """Dependências pesadas (ou submódulos delas) presentes em `timings`."""
+    return sorted(name for name in timings if name.split(".")[0] in HEAVY_MODULES)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(IMPORT_BUDGET_MS))
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        timings = measure_imports(module)
+        total_ms = timings.get(module, 0) / 1000
+        budget = IMPORT_BUDGET_MS.get(module)
+        heavy = heavy_imports(timings)
+        status = "ok"
+        if heavy or (budget is not None and total_ms > budget):
+            status = "FALHOU"
+            failed = True
+        print(f"{module}: {total_ms:.1f} ms (orçamento: {budget} ms) {status}")
+        for name, us in sorted(timings.items(), key=lambda t: -t[1])[1 : args.top + 1]:
+            print(f"  {us / 1000:8.1f} ms  {name}")
+        if heavy:
+            print(f"  dependências pesadas importadas: {', '.join(heavy)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,4 @@
 from __future__ import annotations
-from src.agente.ferramentas import news_search
+from src.agente.ferramentas import news_queries, news_search
 
-__all__ = ["news_search"]
+__all__ = ["news_queries", "news_search"]
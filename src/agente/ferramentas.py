@@ -1,42 +1,208 @@
 from __future__ import annotations
 
-from typing import List, Dict
+from typing import Dict, List, Optional, Tuple
 
+import hashlib
+import http.client
+import json
+import time
+import urllib.error
 import urllib.parse
-import feedparser
+import urllib.request
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from pathlib import Path
 
-from src.configuracao import NEWS_QUERY
+from src.configuracao import (
+    NEWS_CACHE_ENABLED,
+    NEWS_CACHE_TTL,
+    NEWS_FEED_URL,
+    NEWS_QUERY,
+    NEWS_TIMEOUT,
+    PROCESSED_DIR,
+    ensure_dir,
+)
+from src.governance import audit
 
+USER_AGENT = "Mozilla/5.0 (compatible; relatorio-srag)"
 
-def news_search(max_results: int = 8, days_back: int = 14) -> List[Dict[str, str]]:
+# Folga, além do prazo das requisições, para interpretar os feeds.
+_PARSE_GRACE = 1.0
+
+
+def news_queries(query: Optional[str] = None) -> List[str]:
+    """Consultas de `query` (padrão: NEWS_QUERY), separadas por ";"."""
+    return [q.strip() for q in (query or NEWS_QUERY).split(";") if q.strip()]
+
+
+def feed_url(query: str) -> str:
+    return NEWS_FEED_URL.format(q=urllib.parse.quote(query))
+
+
+def _cache_dir() -> Path:
+    return PROCESSED_DIR / "noticias"
+
+
+def _cache_path(url: str) -> Path:
+    return _cache_dir() / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]}.json"
+
+
+def _read_cache(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path: Path, entry: dict) -> None:
+    try:
+        ensure_dir(path.parent)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
+def _http_get(url: str, headers: Dict[str, str], timeout: float):
+    """GET com prazo total de `timeout` segundos; retorna status, corpo e cabeçalhos."""
+    deadline = time.monotonic() + timeout
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **headers})
+    try:
+        resp = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304:
+            return 304, b"", exc.headers
+        raise
+    with resp:
+        chunks = []
+        while True:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Prazo de {timeout}s excedido em {url}")
+            chunk = resp.read(64 * 1024)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return resp.status, b"".join(chunks), resp.headers
+
+
+def _parse_entries(body: bytes) -> List[Dict[str, Optional[str]]]:
+    # feedparser (e certifi/sgmllib) só carrega quando há feed novo.
+    import feedparser
+
+    entries = []
+    for entry in feedparser.parse(body).entries:
+        published = entry.get("published_parsed")
+        entries.append(
+            {
+                "title": entry.get("title", ""),
+                "url": entry.get("link", ""),
+                "published": datetime(*published[:6]).isoformat()
+                if published
+                else None,
+            }
+        )
+    return entries
+
+
+def _fetch_feed(url: str, timeout: float, use_cache: bool) -> Tuple[list, str]:
+    """Entradas do feed e a origem (hit, fetched, not_modified, stale, failed).
+
+    Dentro de NEWS_CACHE_TTL o cache responde sem rede; vencido, a requisição
+    leva If-None-Match/If-Modified-Since e um 304 renova a entrada guardada.
+    Erro ou prazo excedido devolvem as entradas guardadas, mesmo vencidas.
+    """
+    path = _cache_path(url)
+    cached = _read_cache(path) if use_cache else None
+    if cached and time.time() - cached.get("fetched_at", 0) < NEWS_CACHE_TTL:
+        return cached["entries"], "hit"
+
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    try:
+        status, body, resp_headers = _http_get(url, headers, timeout)
+    except (OSError, http.client.HTTPException, ValueError):
+        return (cached["entries"], "stale") if cached else ([], "failed")
+
+    if status == 304 and cached:
+        entries, state = cached["entries"], "not_modified"
+    else:
+        entries, state = _parse_entries(body), "fetched"
+    if use_cache:
+        _write_cache(
+            path,
+            {
+                "url": url,
+                "fetched_at": time.time(),
+                "etag": resp_headers.get("ETag") or (cached or {}).get("etag"),
+                "last_modified": resp_headers.get("Last-Modified")
+                or (cached or {}).get("last_modified"),
+                "entries": entries,
+            },
+        )
+    return entries, state
+
+
+def news_search(
+    max_results: int = 8,
+    days_back: int = 14,
+    queries: Optional[List[str]] = None,
+    timeout: Optional[float] = None,
+    use_cache: Optional[bool] = None,
+) -> List[Dict[str, str]]:
     """Busca manchetes no Google News RSS e retorna uma lista de dicionários.
 
-    Este código é defensivo: retorna strings vazias quando campos não existem
-    e filtra por data usando `published_parsed` quando presente.
+    Cada consulta (padrão: `news_queries()`) é um feed buscado numa thread,
+    com prazo de `timeout` segundos (padrão: NEWS_TIMEOUT); feeds que não
+    respondem a tempo usam as manchetes do cache em disco. As entradas são
+    intercaladas entre os feeds, sem repetir links, e filtradas por data
+    usando `published_parsed` quando presente.
     """
+    if use_cache is None:
+        use_cache = NEWS_CACHE_ENABLED
+    timeout = NEWS_TIMEOUT if timeout is None else timeout
+    urls = list(dict.fromkeys(feed_url(q) for q in (queries or news_queries())))
+    if not urls:
+        return []
 
-    query_terms = NEWS_QUERY
-    q = urllib.parse.quote(query_terms)
-    url = f"https://news.google.com/rss/search?q={q}&hl=pt-BR&gl=BR&ceid=BR:pt-419"
+    pool = ThreadPoolExecutor(max_workers=len(urls))
+    futures = [pool.submit(_fetch_feed, url, timeout, use_cache) for url in urls]
+    wait(futures, timeout=timeout + _PARSE_GRACE)
+    pool.shutdown(wait=False, cancel_futures=True)
 
-    feed = feedparser.parse(url)
-    cutoff = datetime.utcnow() - timedelta(days=days_back)
+    feeds, states = [], Counter()
+    for url, future in zip(urls, futures):
+        if future.done():
+            entries, state = future.result()
+        else:
+            cached = _read_cache(_cache_path(url)) if use_cache else None
+            entries, state = (cached["entries"], "stale") if cached else ([], "failed")
+        feeds.append(entries)
+        states[state] += 1
 
+    cutoff = datetime.utcnow() - timedelta(days=days_back)
     results: List[Dict[str, str]] = []
-    for entry in feed.entries[: max_results * 2]:
-        link = entry.get("link", "")
-        title = entry.get("title", "")
-        published = entry.get("published_parsed")
-
-        if published is not None:
-            published_dt = datetime(*published[:6])
-            if published_dt < cutoff:
+    seen = set()
+    for rank in range(max((len(f) for f in feeds), default=0)):
+        for entries in feeds:
+            if rank >= len(entries) or len(results) >= max_results:
                 continue
+            entry = entries[rank]
+            if (
+                entry["published"]
+                and datetime.fromisoformat(entry["published"]) < cutoff
+            ):
+                continue
+            key = entry["url"] or entry["title"]
+            if key in seen:
+                continue
+            seen.add(key)
+            results.append({"title": entry["title"], "url": entry["url"]})
 
-        results.append({"title": title, "url": link})
-        if len(results) >= max_results:
-            break
-
+    audit("news_search", {"feeds": len(urls), **states, "results": len(results)})
     return results
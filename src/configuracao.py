@@ -6,9 +6,6 @@ edições automáticas anteriores.
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-load_dotenv(override=True)
 
 # Paths
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -19,24 +16,106 @@ REPORTS_DIR = PROJECT_ROOT / "relatorios"
 ASSETS_DIR = PROJECT_ROOT / "recursos"
 TEMPLATES_DIR = PROJECT_ROOT / "modelos"
 
-RAW_DIR.mkdir(parents=True, exist_ok=True)
-PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-ASSETS_DIR.mkdir(parents=True, exist_ok=True)
-TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
+# Variáveis do .env do projeto ou, sem ele, do primeiro .env do diretório
+# atual para cima (como `find_dotenv(usecwd=True)`); python-dotenv só é
+# importado se algum arquivo existir. Nenhum diretório é criado na
+# importação: quem grava chama `ensure_dir` no primeiro uso.
+_ENV_FILE = PROJECT_ROOT / ".env"
+if not _ENV_FILE.is_file():
+    _ENV_FILE = next(
+        (
+            d / ".env"
+            for d in (Path.cwd(), *Path.cwd().parents)
+            if (d / ".env").is_file()
+        ),
+        None,
+    )
+if _ENV_FILE is not None:
+    from dotenv import load_dotenv
+
+    load_dotenv(_ENV_FILE, override=True)
+
+
+def ensure_dir(path: Path) -> Path:
+    """Cria o diretório (e os pais) se ainda não existir e o devolve."""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
 
 # Data source defaults
+# Consultas de notícias separadas por ";" (buscadas em paralelo); vírgulas
+# unem os termos de uma mesma consulta.
 NEWS_QUERY = os.getenv(
     "NEWS_QUERY",
-    'SRAG,"Síndrome Respiratória Aguda Grave",Influenza,COVID-19,Brasil',
+    'SRAG,Brasil;"Síndrome Respiratória Aguda Grave";Influenza,Brasil;COVID-19,Brasil',
+)
+NEWS_FEED_URL = os.getenv(
+    "NEWS_FEED_URL",
+    "https://news.google.com/rss/search?q={q}&hl=pt-BR&gl=BR&ceid=BR:pt-419",
 )
 
+# Busca de notícias: prazo total (s) de cada requisição e cache em disco (em
+# PROCESSED_DIR/noticias) válido por NEWS_CACHE_TTL segundos; vencido, o feed
+# é revalidado com ETag/Last-Modified e, sem rede, as manchetes guardadas são
+# usadas.
+NEWS_TIMEOUT = float(os.getenv("NEWS_TIMEOUT", "5") or 5)
+NEWS_CACHE_ENABLED = os.getenv("NEWS_CACHE_ENABLED", "1") == "1"
+NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "3600") or 0)
+
 SRAG_CSV_PATH = os.getenv("SRAG_CSV_PATH", "").strip()
 SRAG_CSV_URL = os.getenv(
     "SRAG_CSV_URL",
     "https://opendatasus.saude.gov.br/dataset/srag-2021-a-2024",
 ).strip()
 
+# Cache Parquet dos dados limpos (em PROCESSED_DIR)
+CLEAN_CACHE_ENABLED = os.getenv("CLEAN_CACHE_ENABLED", "1") == "1"
+
+# Leitura em blocos do CSV (linhas por bloco; 0 lê o arquivo inteiro)
+try:
+    CLEAN_CHUNKSIZE = int(os.getenv("CLEAN_CHUNKSIZE", "0"))
+except ValueError:
+    CLEAN_CHUNKSIZE = 0
+
+# Métricas em fluxo (--metrics-only): linhas por bloco lido do CSV
+STREAM_CHUNKSIZE = int(os.getenv("STREAM_CHUNKSIZE", "100000") or 100000)
+
+# Atraso sintomas -> notificação: dias do histograma (atrasos maiores caem
+# na última faixa) usados no ajuste de completude das contagens recentes.
+DELAY_MAX_DAYS = int(os.getenv("DELAY_MAX_DAYS", "60") or 60)
+
+# Memo persistente das métricas (em PROCESSED_DIR/metricas), com limite de
+# entradas; as menos usadas recentemente são descartadas.
+METRICS_CACHE_ENABLED = os.getenv("METRICS_CACHE_ENABLED", "1") == "1"
+METRICS_CACHE_MAX_ENTRIES = int(os.getenv("METRICS_CACHE_MAX_ENTRIES", "256") or 256)
+
+# Renderização dos gráficos: processos em paralelo (0 = um por gráfico, até o
+# número de CPUs; 1 renderiza no próprio processo)
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", "0") or 0)
+
+# Backend dos gráficos: "png" (matplotlib/seaborn) ou "svg" (sem dependências)
+CHART_BACKEND = os.getenv("CHART_BACKEND", "png").strip().lower() or "png"
+
+# Cache dos gráficos renderizados (em ASSETS_DIR/graficos), por conteúdo dos
+# dados e do estilo; acima do limite em bytes, os menos usados saem primeiro.
+CHART_CACHE_ENABLED = os.getenv("CHART_CACHE_ENABLED", "1") == "1"
+CHART_CACHE_MAX_BYTES = int(
+    os.getenv("CHART_CACHE_MAX_BYTES", str(50 * 1024 * 1024)) or 50 * 1024 * 1024
+)
+
+# Perfil de qualidade: datas anteriores a QUALITY_MIN_DATE (ou futuras) contam
+# como fora do intervalo; cada distribuição de códigos guarda até
+# QUALITY_MAX_CODES valores (os demais somam em "<outros>").
+QUALITY_MIN_DATE = os.getenv("QUALITY_MIN_DATE", "2009-01-01").strip()
+QUALITY_MAX_CODES = int(os.getenv("QUALITY_MAX_CODES", "50") or 50)
+
+# Processamento incremental (só acréscimos desde a última execução)
+INCREMENTAL_ENABLED = os.getenv("INCREMENTAL_ENABLED", "0") == "1"
+
+# Motor DuckDB (--engine duckdb): 0/vazio usa os padrões do DuckDB
+DUCKDB_THREADS = int(os.getenv("DUCKDB_THREADS", "0") or 0)
+DUCKDB_MEMORY_LIMIT = os.getenv("DUCKDB_MEMORY_LIMIT", "").strip()
+
 # Audit / governance paths
 AUDIT_LOG_PATH = REPORTS_DIR / "audit.log"
 DECISIONS_PATH = REPORTS_DIR / "decisions.jsonl"
@@ -65,7 +144,6 @@ try:
         AUDIT_MAX_BYTES = 5 * 1024 * 1024
 
     ARCHIVE_DIR = REPORTS_DIR / "archive"
-    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
 
     S3_ARCHIVE_BUCKET = os.getenv("S3_ARCHIVE_BUCKET", "")
     S3_ARCHIVE_PREFIX = os.getenv("S3_ARCHIVE_PREFIX", "audit/")
@@ -73,6 +151,21 @@ except Exception:
     AUDIT_MAX_LINES = 5000
 
 
+def _env_codes(name: str, default: str) -> list:
+    return [c.strip().upper() for c in os.getenv(name, default).split(",") if c.strip()]
+
+
+# Tabelas de códigos usadas na derivação dos indicadores (comparação sem
+# diferenciar maiúsculas). Dicionário de dados SRAG: EVOLUCAO 1=Cura,
+# 2=Óbito, 3=Óbito por outras causas, 9=Ignorado; UTI, VACINA e VACINA_COV
+# 1=Sim, 2=Não, 9=Ignorado. Os valores textuais cobrem bases exportadas
+# com rótulos em vez de códigos.
+DEATH_CODES = _env_codes("DEATH_CODES", "2")
+DEATH_KEYWORDS = _env_codes("DEATH_KEYWORDS", "OBITO,ÓBITO,DEATH")
+ICU_CODES = _env_codes("ICU_CODES", "1,SIM,YES,Y,TRUE")
+VACCINATED_CODES = _env_codes("VACCINATED_CODES", "1,SIM,YES,Y,TRUE")
+
+
 RELEVANT_COLUMNS = [
     "dt_sin_pri",
     "dt_notific",
@@ -85,4 +178,19 @@ RELEVANT_COLUMNS = [
     "classi_fin",
     "vacina_cov",
     "vacina",
+    "tp_idade",
+    "sg_uf_not",
+    "co_mun_not",
 ]
+
+# Faixas etárias (limites inferiores, em anos) derivadas de NU_IDADE_N/TP_IDADE
+# antes de os campos sensíveis serem removidos: 0-4, 5-19, ..., 80+.
+AGE_BAND_EDGES = [
+    int(e)
+    for e in os.getenv("AGE_BAND_EDGES", "0,5,20,40,60,80").split(",")
+    if e.strip()
+]
+
+# Métricas estratificadas: células com menos casos que isto são suprimidas
+# (0 desativa a supressão).
+STRATA_MIN_CELL = int(os.getenv("STRATA_MIN_CELL", "5") or 0)
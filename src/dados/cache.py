@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+
+import json
+
+from pathlib import Path
+
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+
+from src.configuracao import PROCESSED_DIR, ensure_dir
+
+
+_READ_BLOCK_BYTES = 1024 * 1024
+
+_KEY_PREFIX_LEN = 16
+
+
+def file_fingerprint(path: Path) -> str:
+    """Hash SHA-256 do conteúdo do arquivo, lido em blocos de 1 MiB."""
+
+    h = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_READ_BLOCK_BYTES), b""):
+            h.update(block)
+
+    return h.hexdigest()
+
+
+def cache_key(source: Path, config: Dict[str, Any]) -> str:
+    """Chave do cache: conteúdo do arquivo de origem + configuração da limpeza."""
+
+    payload = json.dumps(
+        {"source": file_fingerprint(source), "config": config},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_path(source: Path, key: str) -> Path:
+    return PROCESSED_DIR / f"{Path(source).name}.{key[:_KEY_PREFIX_LEN]}.parquet"
+
+
+def read_cached_frame(path: Path) -> Optional[pd.DataFrame]:
+    """Lê um DataFrame do cache; entradas ilegíveis são removidas (miss)."""
+
+    if not path.exists():
+        return None
+
+    try:
+        return pd.read_parquet(path)
+
+    except Exception:
+        path.unlink(missing_ok=True)
+
+        return None
+
+
+def write_cached_frame(df: pd.DataFrame, source: Path, path: Path) -> None:
+    """Grava o DataFrame em Parquet e invalida entradas antigas do mesmo arquivo."""
+
+    ensure_dir(path.parent)
+
+    tmp = path.with_name(path.name + ".tmp")
+
+    df.to_parquet(tmp, index=True)
+
+    tmp.replace(path)
+
+    stale_pattern = f"{Path(source).name}.{'?' * _KEY_PREFIX_LEN}.parquet"
+
+    for old in path.parent.glob(stale_pattern):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def prefix_digests(path: Path, old_size: int, new_size: int) -> Tuple[str, str]:
+    """SHA-256 dos primeiros `old_size` e `new_size` bytes, numa só leitura."""
+
+    h = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        remaining = old_size
+
+        while remaining > 0:
+            block = f.read(min(_READ_BLOCK_BYTES, remaining))
+
+            if not block:
+                break
+
+            h.update(block)
+
+            remaining -= len(block)
+
+        old_digest = h.hexdigest()
+
+        remaining = new_size - old_size
+
+        while remaining > 0:
+            block = f.read(min(_READ_BLOCK_BYTES, remaining))
+
+            if not block:
+                break
+
+            h.update(block)
+
+            remaining -= len(block)
+
+    return old_digest, h.hexdigest()
+
+
+def _incremental_paths(source: Path) -> Tuple[Path, Path]:
+    name = f"{Path(source).name}.incremental"
+
+    return PROCESSED_DIR / f"{name}.parquet", PROCESSED_DIR / f"{name}.json"
+
+
+def read_incremental_store(
+    source: Path,
+) -> Tuple[Optional[Dict[str, Any]], Optional[pd.DataFrame]]:
+    """Lê o armazenamento incremental (marca d'água + DataFrame) de um arquivo."""
+
+    store_path, state_path = _incremental_paths(source)
+
+    if not state_path.exists():
+        return None, None
+
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+
+    except Exception:
+        return None, None
+
+    return state, read_cached_frame(store_path)
+
+
+def write_incremental_store(
+    source: Path, df: pd.DataFrame, state: Dict[str, Any]
+) -> None:
+    store_path, state_path = _incremental_paths(source)
+
+    ensure_dir(store_path.parent)
+
+    # A marca d'água sai antes e volta depois dos dados: uma falha no meio do
+    # caminho deixa o armazenamento sem estado e força reconstrução.
+    state_path.unlink(missing_ok=True)
+
+    tmp = store_path.with_name(store_path.name + ".tmp")
+
+    df.to_parquet(tmp, index=True)
+
+    tmp.replace(store_path)
+
+    state_path.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
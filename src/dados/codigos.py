@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import re
+
+from typing import Callable
+
+import numpy as np
+
+import pandas as pd
+
+
+from src.configuracao import DEATH_CODES, DEATH_KEYWORDS, ICU_CODES, VACCINATED_CODES
+
+
+_NUMERIC_CODE = re.compile(r"^(\d+)\.0+$")
+
+
+def normalize_code(value: str) -> str:
+    """Normaliza um código bruto: sem espaços, maiúsculo e sem sufixo ".0"."""
+
+    code = str(value).strip().upper()
+
+    match = _NUMERIC_CODE.match(code)
+
+    return match.group(1) if match else code
+
+
+def is_death_code(code: str) -> bool:
+    return code in DEATH_CODES or any(k in code for k in DEATH_KEYWORDS)
+
+
+def is_icu_code(code: str) -> bool:
+    return code in ICU_CODES
+
+
+def is_vaccinated_code(code: str) -> bool:
+    return code in VACCINATED_CODES
+
+
+def flag_from_codes(series: pd.Series, classify: Callable[[str], bool]) -> pd.Series:
+    """Deriva um indicador booleano classificando cada código distinto uma vez.
+
+    A coluna é convertida para categórica; `classify` roda sobre as
+    categorias normalizadas (e sobre "NAN" para valores ausentes) e o
+    resultado é propagado para as linhas pelos códigos da categoria.
+    """
+
+    cat = series.astype("category")
+
+    lookup = np.array(
+        [classify(normalize_code(c)) for c in cat.cat.categories] + [classify("NAN")],
+        dtype=bool,
+    )
+
+    # Código -1 (ausente) indexa o último elemento da tabela.
+    return pd.Series(lookup[cat.cat.codes.to_numpy()], index=series.index)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+import pandas as pd
+
+
+# Layout de largura fixa: (posições do dia, do mês, do ano, separadores).
+_FIXED_LAYOUTS = {
+    "dmy": ((0, 1), (3, 4), (6, 7, 8, 9), {2: "/", 5: "/"}),
+    "iso": ((8, 9), (5, 6), (0, 1, 2, 3), {4: "-", 7: "-"}),
+}
+
+# Formatos aceitos, em ordem, para os valores que não passam no caminho rápido
+# (espaços nas pontas são ignorados). O motor DuckDB usa a mesma lista, para
+# que os dois motores reconheçam exatamente as mesmas datas.
+DATE_FORMATS = [
+    "%d/%m/%Y",
+    "%Y-%m-%d",
+    "%d-%m-%Y",
+    "%Y%m%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+]
+
+_FIXED_WIDTH = 10
+
+SAMPLE_SIZE = 1000
+
+
+def _code_points(values: np.ndarray) -> np.ndarray:
+    # Um caractere a mais que a largura fixa: valores mais longos ficam com a
+    # última posição preenchida e são descartados pela validação.
+    width = _FIXED_WIDTH + 1
+
+    points = values.astype(f"U{width}").view(np.uint32).reshape(-1, width)
+
+    # Só dígitos e separadores ASCII são comparados: um byte por caractere
+    # basta, e os demais caracteres viram 255, que nunca casa.
+    return np.minimum(points, 255, out=points).astype(np.uint8)
+
+
+def _digits(
+    points: np.ndarray, positions: Tuple[int, ...]
+) -> Tuple[np.ndarray, np.ndarray]:
+    value = np.zeros(len(points), dtype=np.int64)
+
+    ok = np.ones(len(points), dtype=bool)
+
+    for pos in positions:
+        d = points[:, pos].astype(np.int64) - ord("0")
+
+        ok &= (d >= 0) & (d <= 9)
+
+        value = value * 10 + d
+
+    return value, ok
+
+
+def _parse_fixed_width(points: np.ndarray, kind: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte datas de largura fixa sem passar por strptime.
+
+    Retorna (datas em datetime64[ns], máscara dos valores convertidos).
+    """
+
+    day_pos, month_pos, year_pos, separators = _FIXED_LAYOUTS[kind]
+
+    day, ok_day = _digits(points, day_pos)
+
+    month, ok_month = _digits(points, month_pos)
+
+    year, ok_year = _digits(points, year_pos)
+
+    ok = ok_day & ok_month & ok_year & (points[:, _FIXED_WIDTH] == 0)
+
+    for pos, sep in separators.items():
+        ok &= points[:, pos] == ord(sep)
+
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+
+    # Anos fora do intervalo de datetime64[ns] (digitações como 0202 ou 9999)
+    # transbordariam na conversão; seguem para o caminho lento e viram NaT.
+    ok &= (year >= 1678) & (year <= 2261)
+
+    months = np.where(ok, (year - 1970) * 12 + (month - 1), 0).astype("datetime64[M]")
+
+    days = months.astype("datetime64[D]") + np.where(ok, day - 1, 0)
+
+    # Dias inexistentes (31/02, por exemplo) transbordam para o mês seguinte.
+    ok &= days.astype("datetime64[M]") == months
+
+    return days.astype("datetime64[ns]"), ok
+
+
+def infer_date_format(series: pd.Series, sample_size: int = SAMPLE_SIZE) -> str:
+    """Amostra a coluna e classifica seu formato: "dmy", "iso", "mixed" ou "unknown"."""
+
+    values = series.dropna().to_numpy(dtype=object)
+
+    if len(values) == 0:
+        return "unknown"
+
+    step = max(1, len(values) // sample_size)
+
+    points = _code_points(values[::step][:sample_size])
+
+    matches = [
+        kind for kind in _FIXED_LAYOUTS if _parse_fixed_width(points, kind)[1].any()
+    ]
+
+    if len(matches) > 1:
+        return "mixed"
+
+    return matches[0] if matches else "unknown"
+
+
+def parse_date_column(series: pd.Series) -> Tuple[pd.Series, Dict[str, Any]]:
+    """Converte uma coluna de datas em texto para datetime64[ns].
+
+    O formato é escolhido por amostragem (`infer_date_format`); os valores que
+    seguem o formato passam por uma conversão vetorizada de largura fixa e só
+    os demais são tentados, em ordem, com os formatos de DATE_FORMATS.
+    Valores não reconhecidos viram NaT. Retorna a série convertida e as
+    contagens de cada caminho.
+    """
+
+    kind = infer_date_format(series)
+
+    raw = series.to_numpy(dtype=object)
+
+    notna = pd.notna(raw)
+
+    result = np.full(len(raw), np.datetime64("NaT"), dtype="datetime64[ns]")
+
+    done = ~notna
+
+    if kind != "unknown":
+        idx = np.flatnonzero(notna)
+
+        points = _code_points(raw[idx])
+
+        kinds = list(_FIXED_LAYOUTS) if kind == "mixed" else [kind]
+
+        for k in kinds:
+            parsed, ok = _parse_fixed_width(points, k)
+
+            ok &= ~done[idx]
+
+            result[idx[ok]] = parsed[ok]
+
+            done[idx[ok]] = True
+
+    fast = int(done.sum() - (~notna).sum())
+
+    rest = np.flatnonzero(~done)
+
+    fallback = 0
+
+    if len(rest):
+        remaining = pd.Series(raw[rest]).astype(str).str.strip()
+
+        for fmt in DATE_FORMATS:
+            parsed = pd.to_datetime(remaining, errors="coerce", format=fmt)
+
+            remaining = remaining.where(parsed.isna())
+
+            ok = parsed.notna().to_numpy()
+
+            result[rest[ok]] = parsed[ok].to_numpy(dtype="datetime64[ns]")
+
+            fallback += int(ok.sum())
+
+    stats = {
+        "format": kind,
+        "fast": fast,
+        "fallback": fallback,
+        "unparsed": int(notna.sum()) - fast - fallback,
+    }
+
+    return pd.Series(result, index=series.index, name=series.name), stats
@@ -1,9 +1,22 @@
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, TypeVar
 import glob
-from src.configuracao import RAW_DIR, SRAG_CSV_PATH, PROJECT_ROOT
+import gzip
+import io
+import zipfile
+import pandas as pd
+from src.configuracao import RAW_DIR, RELEVANT_COLUMNS, SRAG_CSV_PATH, PROJECT_ROOT
 from src.governance import audit
 
+_SNIFF_BYTES = 1024 * 1024
+_DELIMITERS = [",", ";", "\t", "|"]
+# Formatos aceitos em dados/brutos: CSV puro, comprimido ou dentro de um .zip.
+SRAG_PATTERNS = ["*.csv", "*.csv.gz", "*.csv.zst", "*.zip"]
+_COMPRESSED_SUFFIXES = (".gz", ".zst", ".zip")
+
+_T = TypeVar("_T")
+
 
 def ensure_srag_csv(optional_path: Optional[str] = None) -> Path:
     """Retorna um caminho válido para o CSV de SRAG.
@@ -25,14 +38,14 @@ def ensure_srag_csv(optional_path: Optional[str] = None) -> Path:
             audit("select_csv", {"method": "env", "path": str(env_path)})
             return env_path
 
-    candidates = sorted(glob.glob(str(RAW_DIR / "*.csv")))
+    candidates = _glob_sources(RAW_DIR)
     if candidates:
         p = Path(candidates[0])
         audit("select_csv", {"method": "raw_dir_first", "path": str(p)})
         return p
 
     legacy_raw = PROJECT_ROOT / "data" / "raw"
-    legacy_candidates = sorted(glob.glob(str(legacy_raw / "*.csv")))
+    legacy_candidates = _glob_sources(legacy_raw)
     if legacy_candidates:
         p = Path(legacy_candidates[0])
         audit("select_csv", {"method": "legacy_data_raw", "path": str(p)})
@@ -41,3 +54,226 @@ def ensure_srag_csv(optional_path: Optional[str] = None) -> Path:
     raise FileNotFoundError(
         "Nenhum CSV de SRAG encontrado. Coloque um arquivo em 'dados/brutos' (ou antigo 'data/raw') ou use --csv / SRAG_CSV_PATH."
     )
+
+
+def _glob_sources(directory: Path) -> List[str]:
+    return sorted(
+        {c for pattern in SRAG_PATTERNS for c in glob.glob(str(directory / pattern))}
+    )
+
+
+def _srag_source_dirs() -> List[Path]:
+    return [RAW_DIR, PROJECT_ROOT / "data" / "raw"]
+
+
+def discover_srag_csvs() -> List[Path]:
+    """Retorna todos os CSVs de SRAG em dados/brutos e no legado data/raw.
+
+    O OpenDataSUS publica um arquivo por ano (CSV ou .zip; veja SRAG_PATTERNS);
+    a lista é ordenada por nome e sem duplicatas. Lança FileNotFoundError se
+    nada for encontrado.
+    """
+    found: List[Path] = []
+    seen = set()
+    for directory in _srag_source_dirs():
+        for candidate in _glob_sources(directory):
+            resolved = Path(candidate).resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                found.append(Path(candidate))
+
+    if not found:
+        raise FileNotFoundError(
+            "Nenhum CSV de SRAG encontrado em 'dados/brutos' nem em 'data/raw'."
+        )
+
+    audit("select_csv", {"method": "all_files", "paths": [str(p) for p in found]})
+    return found
+
+
+def is_compressed_source(path: Path) -> bool:
+    return Path(path).suffix.lower() in _COMPRESSED_SUFFIXES
+
+
+class _ZipMembersStream(io.RawIOBase):
+    """Lê os CSVs de um .zip em sequência, como se fossem um único arquivo.
+
+    Os membros são descomprimidos sob demanda, sem extração em disco; o
+    cabeçalho só é mantido no primeiro, e os demais precisam ter o mesmo.
+    """
+
+    def __init__(self, archive: zipfile.ZipFile, members: List[str]):
+        self._archive = archive
+        self._members = list(members)
+        self._current: Optional[BinaryIO] = None
+        self._header: Optional[bytes] = None
+        self._pending = b""
+        self._last = b"\n"
+
+    def readable(self) -> bool:
+        return True
+
+    def _next_member(self) -> bool:
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        if not self._members:
+            return False
+        name = self._members.pop(0)
+        self._current = self._archive.open(name)
+        header = self._current.readline()
+        if self._header is None:
+            self._header = header
+            self._pending = header
+        elif header.rstrip(b"\r\n") != self._header.rstrip(b"\r\n"):
+            raise ValueError(f"Cabeçalho diferente no membro {name} do arquivo zip")
+        else:
+            # Garante a quebra de linha entre membros sem newline final.
+            self._pending = b"" if self._last == b"\n" else b"\n"
+        return True
+
+    def readinto(self, buffer) -> int:
+        while True:
+            if self._current is None and not self._next_member():
+                return 0
+            if self._pending:
+                n = min(len(buffer), len(self._pending))
+                buffer[:n] = self._pending[:n]
+                self._pending = self._pending[n:]
+                self._last = bytes(buffer[n - 1 : n])
+                return n
+            n = self._current.readinto(buffer)
+            if n:
+                self._last = bytes(buffer[n - 1 : n])
+                return n
+            if not self._next_member():
+                return 0
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        self._archive.close()
+        super().close()
+
+
+@contextmanager
+def open_srag_stream(path: Path) -> Iterator[BinaryIO]:
+    """Abre o arquivo de SRAG como fluxo binário do CSV descomprimido.
+
+    Aceita `.csv`, `.csv.gz`, `.csv.zst` (requer `zstandard`) e `.zip` com um
+    ou mais CSVs; a descompressão acontece enquanto o leitor consome o fluxo.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        stream = gzip.open(path, "rb")
+    elif suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise RuntimeError(
+                "Leitura de .csv.zst requer o pacote 'zstandard' "
+                "(pip install zstandard)"
+            ) from exc
+        stream = io.BufferedReader(
+            zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        )
+    elif suffix == ".zip":
+        archive = zipfile.ZipFile(path)
+        members = sorted(n for n in archive.namelist() if n.lower().endswith(".csv"))
+        if not members:
+            archive.close()
+            raise FileNotFoundError(f"Nenhum CSV dentro do arquivo zip: {path}")
+        stream = io.BufferedReader(_ZipMembersStream(archive, members))
+    else:
+        stream = open(path, "rb")
+    try:
+        yield stream
+    finally:
+        stream.close()
+
+
+def _guess_encoding(sample: bytes) -> str:
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # Um caractere multibyte cortado no fim da amostra não invalida o UTF-8.
+        if exc.start < len(sample) - 3:
+            return "latin-1"
+    return "utf-8"
+
+
+def canonical_columns(header: List[str]) -> Dict[str, str]:
+    """Mapa nome canônico -> nome bruto das colunas de RELEVANT_COLUMNS no cabeçalho.
+
+    A comparação ignora maiúsculas e espaços; a ordem é a do cabeçalho e, em
+    nomes repetidos, vale a primeira ocorrência.
+    """
+    wanted = set(RELEVANT_COLUMNS)
+    columns: Dict[str, str] = {}
+    for raw in header:
+        name = str(raw).strip().lower()
+        if name in wanted and name not in columns:
+            columns[name] = raw
+    return columns
+
+
+def sniff_csv_layout(path: Path) -> Dict[str, Any]:
+    """Lê apenas o início do CSV para descobrir delimitador, codificação e colunas.
+
+    Arquivos comprimidos são lidos pelo mesmo fluxo de `open_srag_stream`.
+
+    Os arquivos do DATASUS usam `;` e latin-1; os nomes do cabeçalho são
+    comparados com RELEVANT_COLUMNS sem diferenciar maiúsculas nem espaços.
+    Retorna os argumentos `sep`, `encoding` e `usecols` para `pd.read_csv`
+    (`usecols` é None quando nenhuma coluna relevante é reconhecida), o
+    cabeçalho completo em `columns` e o mapa de `canonical_columns` em
+    `canonical`.
+    """
+    with open_srag_stream(path) as f:
+        sample = f.read(_SNIFF_BYTES)
+
+    encoding = _guess_encoding(sample)
+    first_line = sample.split(b"\n", 1)[0].decode(encoding, errors="replace")
+    sep = max(_DELIMITERS, key=first_line.count)
+
+    header = pd.read_csv(
+        io.BytesIO(sample), sep=sep, encoding=encoding, nrows=0
+    ).columns.tolist()
+    canonical = canonical_columns(header)
+    usecols = list(canonical.values())
+
+    audit(
+        "sniff_csv",
+        {
+            "path": str(path),
+            "sep": sep,
+            "encoding": encoding,
+            "columns_total": len(header),
+            "columns_used": len(usecols),
+        },
+    )
+
+    return {
+        "sep": sep,
+        "encoding": encoding,
+        "usecols": usecols or None,
+        "columns": header,
+        "canonical": canonical,
+    }
+
+
+def read_with_encoding_retry(
+    read: Callable[[Dict[str, Any]], _T], layout: Dict[str, Any]
+) -> _T:
+    """Chama `read(layout)` e, se o arquivo não for UTF-8, repete em latin-1.
+
+    `sniff_csv_layout` só vê o início do arquivo; um byte latin-1 mais adiante
+    aparece como UnicodeDecodeError no meio da leitura.
+    """
+    try:
+        return read(layout)
+    except UnicodeDecodeError:
+        # A amostra inicial parecia UTF-8, mas o restante do arquivo não é.
+        return read(dict(layout, encoding="latin-1"))
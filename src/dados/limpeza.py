@@ -1,32 +1,608 @@
 from __future__ import annotations
 
+import io
+
+import os
+
+from contextlib import nullcontext
+
+from concurrent.futures import ProcessPoolExecutor
+
 from pathlib import Path
 
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
 import numpy as np
 
 
-from src.configuracao import RELEVANT_COLUMNS, SENSITIVE_FIELDS
+from src.configuracao import (
+    AGE_BAND_EDGES,
+    CLEAN_CACHE_ENABLED,
+    CLEAN_CHUNKSIZE,
+    INCREMENTAL_ENABLED,
+    QUALITY_MIN_DATE,
+    RELEVANT_COLUMNS,
+    SENSITIVE_FIELDS,
+)
+
+from src.dados.cache import (
+    cache_key,
+    cache_path,
+    prefix_digests,
+    read_cached_frame,
+    read_incremental_store,
+    write_cached_frame,
+    write_incremental_store,
+)
+
+from src.dados.codigos import (
+    flag_from_codes,
+    is_death_code,
+    is_icu_code,
+    is_vaccinated_code,
+)
+
+from src.dados.datas import parse_date_column
+
+from src.dados.ingestao import (
+    is_compressed_source,
+    open_srag_stream,
+    read_with_encoding_retry,
+    sniff_csv_layout,
+)
+
+from src.dados.qualidade import (
+    finalize_quality_profile,
+    merge_quality_profiles,
+    new_quality_profile,
+    profile_clean_chunk,
+    profile_raw_chunk,
+    quality_profile,
+    raw_date_mask,
+)
 
 from src.governance import audit
 
 
+# Incrementar sempre que a lógica de limpeza mudar, para invalidar o cache Parquet.
+CLEAN_VERSION = 8
+
+DATE_COLUMNS = ["dt_sin_pri", "dt_notific", "dt_interna"]
+
+DERIVED_COLUMNS = [
+    "case_date",
+    "icu_flag",
+    "death_flag",
+    "vaccinated_flag",
+    "age_band",
+]
+
+# Colunas de código (e datas não usadas nas janelas) mantidas como categóricas.
+CODED_COLUMNS = [c for c in RELEVANT_COLUMNS if c not in DATE_COLUMNS]
+
+# Linhas medidas (espaçadas) para estimar a memória de cada bloco antes da
+# compactação; medir as colunas de texto inteiras custava ~20% da limpeza.
+MEMORY_SAMPLE_ROWS = 10_000
+
+
 def _normalize_columns(columns: List[str]) -> List[str]:
     return [c.strip().lower() for c in columns]
 
 
-def _parse_date(series: pd.Series) -> pd.Series:
-    return pd.to_datetime(series, errors="coerce", dayfirst=False, format=None)
+def _clean_config() -> dict:
+    return {
+        "version": CLEAN_VERSION,
+        "relevant_columns": list(RELEVANT_COLUMNS),
+        "sensitive_fields": list(SENSITIVE_FIELDS),
+        "age_band_edges": list(AGE_BAND_EDGES),
+        "quality_min_date": QUALITY_MIN_DATE,
+    }
+
+
+def load_and_clean_srag(
+    csv_path: Path,
+    use_cache: Optional[bool] = None,
+    chunksize: Optional[int] = None,
+    incremental: Optional[bool] = None,
+) -> pd.DataFrame:
+    """Lê e limpa o CSV de SRAG.
+
+    Com o cache habilitado (padrão: CLEAN_CACHE_ENABLED), o resultado é
+    persistido em Parquet em PROCESSED_DIR, com chave derivada do conteúdo do
+    arquivo e da configuração de limpeza; execuções seguintes sobre a mesma
+    entrada leem o Parquet diretamente.
+
+    Com `chunksize` (padrão: CLEAN_CHUNKSIZE; 0 desativa), o CSV é lido e limpo
+    em blocos, limitando o pico de memória; o resultado é idêntico ao da
+    leitura integral.
+
+    Com `incremental` (padrão: INCREMENTAL_ENABLED), o cache por conteúdo dá
+    lugar a um armazenamento por arquivo com marca d'água; veja
+    `_load_and_clean_incremental`.
+    """
+
+    csv_path = Path(csv_path)
+
+    if incremental is None:
+        incremental = INCREMENTAL_ENABLED
+
+    if use_cache is None:
+        use_cache = CLEAN_CACHE_ENABLED
+
+    if chunksize is None:
+        chunksize = CLEAN_CHUNKSIZE
+
+    if incremental:
+        return _load_and_clean_incremental(csv_path, chunksize)
+
+    if not use_cache:
+        audit("clean_cache", {"path": str(csv_path), "status": "bypass"})
+
+        return _load_and_clean(csv_path, chunksize)[0]
+
+    key = cache_key(csv_path, _clean_config())
+
+    cached_path = cache_path(csv_path, key)
+
+    cached = read_cached_frame(cached_path)
+
+    if cached is not None:
+        cached = _restore_categories(cached)
+
+        audit(
+            "clean_cache",
+            {
+                "path": str(csv_path),
+                "status": "hit",
+                "cache_path": str(cached_path),
+                "rows": int(len(cached)),
+            },
+        )
+
+        return cached
+
+    df = _load_and_clean(csv_path, chunksize)[0]
+
+    details = {
+        "path": str(csv_path),
+        "status": "miss",
+        "cache_path": str(cached_path),
+        "rows": int(len(df)),
+    }
+
+    try:
+        write_cached_frame(df, csv_path, cached_path)
+
+    except Exception as exc:
+        details["status"] = "miss_write_failed"
+
+        details["error"] = str(exc)
+
+    audit("clean_cache", details)
+
+    return df
+
+
+def load_and_clean_many(
+    csv_paths: Sequence[Path],
+    use_cache: Optional[bool] = None,
+    chunksize: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    incremental: Optional[bool] = None,
+) -> pd.DataFrame:
+    """Limpa vários CSVs de SRAG em paralelo e junta o resultado.
+
+    Cada arquivo é limpo por `load_and_clean_srag` em um processo do pool (um
+    arquivo por worker, com o mesmo cache). Os quadros são unidos com um
+    esquema estável: colunas de RELEVANT_COLUMNS na ordem da configuração,
+    colunas ausentes em algum arquivo preenchidas como nulas e
+    `vaccinated_flag` como booleano anulável quando algum arquivo não tem
+    informação de vacinação.
+    """
+
+    csv_paths = [Path(p) for p in csv_paths]
+
+    if not csv_paths:
+        raise ValueError("Nenhum arquivo informado para limpeza")
+
+    workers = min(len(csv_paths), max_workers or os.cpu_count() or 1)
+
+    if workers <= 1:
+        frames = [
+            load_and_clean_srag(p, use_cache, chunksize, incremental) for p in csv_paths
+        ]
+
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(
+                pool.map(
+                    load_and_clean_srag,
+                    csv_paths,
+                    [use_cache] * len(csv_paths),
+                    [chunksize] * len(csv_paths),
+                    [incremental] * len(csv_paths),
+                )
+            )
+
+    df = _merge_cleaned_frames(frames)
+
+    audit(
+        "merge_csvs",
+        {
+            "files": [
+                {"path": str(p), "rows": int(len(f))} for p, f in zip(csv_paths, frames)
+            ],
+            "rows_total": int(len(df)),
+            "workers": workers,
+        },
+    )
+
+    return df
+
+
+def _merge_cleaned_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    present = set().union(*(f.columns for f in frames))
+
+    columns = [c for c in RELEVANT_COLUMNS + DERIVED_COLUMNS if c in present]
+
+    aligned = []
+
+    for f in frames:
+        f = f.reset_index(drop=True)
+
+        for c in columns:
+            if c not in f.columns:
+                dtype = "datetime64[ns]" if c in DATE_COLUMNS else "category"
+
+                f[c] = pd.Series(None, index=f.index, dtype=dtype)
+
+        aligned.append(f[columns])
+
+    merged = _concat_frames(aligned, ignore_index=True)
+
+    merged.attrs["quality"] = merge_quality_profiles(
+        [quality_profile(f) for f in frames]
+    )
+
+    return merged
+
+
+def _concat_frames(frames: List[pd.DataFrame], **kwargs: Any) -> pd.DataFrame:
+    """Concatena DataFrames limpos preservando as colunas categóricas.
+
+    `pd.concat` só mantém o tipo categórico quando as categorias são iguais;
+    aqui elas são unidas (ordenadas, como em `astype("category")`) antes.
+    """
+
+    if len(frames) > 1:
+        for c in frames[0].columns:
+            if not all(
+                c in f.columns and isinstance(f[c].dtype, pd.CategoricalDtype)
+                for f in frames
+            ):
+                continue
+
+            # Categorias fixas (como as faixas etárias) já coincidem.
+            if all(f[c].dtype == frames[0][c].dtype for f in frames):
+                continue
+
+            categories = (
+                pd.Index(
+                    np.concatenate([f[c].cat.categories.astype(object) for f in frames])
+                )
+                .unique()
+                .sort_values()
+            )
+
+            frames = [
+                f.assign(**{c: f[c].cat.set_categories(categories)}) for f in frames
+            ]
+
+    return pd.concat(frames, **kwargs)
+
+
+def _load_and_clean_incremental(
+    csv_path: Path, chunksize: Optional[int] = None
+) -> pd.DataFrame:
+    """Limpa só as notificações acrescentadas desde a última execução.
+
+    A marca d'água guarda o tamanho já processado, o SHA-256 desses bytes e o
+    número de linhas lidas. Se o arquivo atual começa exatamente com os mesmos
+    bytes (atualização só por acréscimo), apenas o trecho novo é lido, limpo
+    e unido ao armazenamento em PROCESSED_DIR, com o índice continuando de
+    onde parou; o resultado é o mesmo da limpeza completa. Se o arquivo foi
+    reescrito ou é comprimido e mudou, a configuração de limpeza mudou ou o
+    estado está ausente, tudo é reconstruído.
+    """
+
+    state, store = read_incremental_store(csv_path)
+
+    if store is not None:
+        store = _restore_categories(store)
+
+    size = csv_path.stat().st_size
+
+    config = _clean_config()
+
+    status, reason = "rebuild", "no_state"
+
+    if state is not None and store is not None:
+        old_size = int(state.get("size", -1))
+
+        if state.get("config") != config:
+            reason = "config_changed"
+
+        elif not (0 <= old_size <= size) or not state.get("ends_with_newline"):
+            reason = "rewritten"
+
+        else:
+            old_digest, new_digest = prefix_digests(csv_path, old_size, size)
+
+            if old_digest != state.get("sha256"):
+                reason = "rewritten"
+
+            elif old_size != size and is_compressed_source(csv_path):
+                # Bytes acrescentados a um arquivo comprimido não são linhas novas.
+                reason = "compressed"
+
+            else:
+                status, reason = ("unchanged" if old_size == size else "append"), None
+
+    if status == "unchanged":
+        df, rows_read, rows_new = store, int(state["rows_read"]), 0
+
+    elif status == "append":
+        with open(csv_path, "rb") as f:
+            f.seek(int(state["size"]))
+
+            tail = f.read(size - int(state["size"]))
+
+        new, rows_new = _load_and_clean(csv_path, chunksize, tail=tail)
+
+        new.index = new.index + int(state["rows_read"])
+
+        df = _concat_frames([store, new])
+
+        df.attrs["quality"] = merge_quality_profiles(
+            [quality_profile(store), quality_profile(new)]
+        )
+
+        rows_read = int(state["rows_read"]) + rows_new
+
+    else:
+        df, rows_read = _load_and_clean(csv_path, chunksize)
+
+        rows_new = rows_read
+
+        new_digest = prefix_digests(csv_path, 0, size)[1]
+
+    if status != "unchanged":
+        with open(csv_path, "rb") as f:
+            f.seek(max(size - 1, 0))
+
+            ends_with_newline = size == 0 or f.read(1) == b"\n"
+
+        max_notific = df["dt_notific"].max() if "dt_notific" in df.columns else None
+
+        write_incremental_store(
+            csv_path,
+            df,
+            {
+                "size": size,
+                "sha256": new_digest,
+                "ends_with_newline": ends_with_newline,
+                "rows_read": rows_read,
+                "max_dt_notific": None if pd.isna(max_notific) else str(max_notific),
+                "config": config,
+            },
+        )
+
+    audit(
+        "clean_incremental",
+        {
+            "path": str(csv_path),
+            "status": status,
+            "reason": reason,
+            "rows_new": rows_new,
+            "rows_total": int(len(df)),
+        },
+    )
+
+    return df
+
+
+def _load_and_clean(
+    csv_path: Path, chunksize: Optional[int] = None, tail: Optional[bytes] = None
+) -> Tuple[pd.DataFrame, int]:
+    """Lê e limpa o CSV; com `tail`, limpa só esses bytes (sem cabeçalho).
+
+    Retorna o DataFrame limpo e o número de linhas lidas.
+    """
+
+    layout = sniff_csv_layout(csv_path)
+
+    extra: Dict[str, Any] = {}
+
+    if tail is not None:
+        extra = {"header": None, "names": layout["columns"]}
+
+    def read(layout: Dict[str, Any]):
+        if tail is None:
+            opened = open_srag_stream(csv_path)
+
+        else:
+            opened = nullcontext(io.BytesIO(tail))
+
+        with opened as source:
+            return _read_and_clean(source, layout, chunksize, extra)
+
+    df, rows_read, stats = read_with_encoding_retry(read, layout)
+
+    df.attrs["quality"] = finalize_quality_profile(stats["quality"], stats["dates"])
+
+    audit(
+        "load_csv",
+        {
+            "path": str(csv_path),
+            "rows_read": rows_read,
+            "columns_read": len(layout["usecols"]) if layout["usecols"] else None,
+            "chunksize": chunksize or None,
+            "tail_bytes": len(tail) if tail is not None else None,
+        },
+    )
+
+    audit("parse_dates", {"path": str(csv_path), "columns": stats["dates"]})
+
+    audit(
+        "clean_csv",
+        {
+            "path": str(csv_path),
+            "rows_after_clean": int(len(df)),
+            "sensitive_cleared": SENSITIVE_FIELDS,
+        },
+    )
+
+    memory = stats["memory"]
+
+    audit(
+        "clean_memory",
+        {
+            "path": str(csv_path),
+            "bytes_before": sum(memory["before"].values()),
+            "bytes_after": sum(memory["after"].values()),
+            "columns_before": memory["before"],
+            "columns_after": memory["after"],
+            "dtypes": {c: str(t) for c, t in df.dtypes.items()},
+        },
+    )
+
+    profile = df.attrs["quality"]
+
+    audit(
+        "quality_profile",
+        {
+            "path": str(csv_path),
+            "rows_read": profile["rows_read"],
+            "rows_kept": profile["rows_kept"],
+            "dropped": profile["dropped"],
+            "unparseable": profile["unparseable"],
+        },
+    )
+
+    return df, rows_read
+
+
+def _read_and_clean(
+    source: Any,
+    layout: Dict[str, Any],
+    chunksize: Optional[int],
+    extra: Optional[Dict[str, Any]] = None,
+) -> Tuple[pd.DataFrame, int, Dict[str, Dict[str, Any]]]:
+    read_kwargs = dict(
+        sep=layout["sep"],
+        encoding=layout["encoding"],
+        usecols=layout["usecols"],
+        dtype=str,
+        **(extra or {}),
+    )
+
+    if chunksize:
+        return _read_and_clean_chunked(source, read_kwargs, chunksize)
+
+    df = pd.read_csv(source, low_memory=False, **read_kwargs)
+
+    stats = _new_clean_stats()
+
+    return _clean_frame(df, stats), int(len(df)), stats
+
 
+def _read_and_clean_chunked(
+    source: Any, read_kwargs: Dict[str, Any], chunksize: int
+) -> Tuple[pd.DataFrame, int, Dict[str, Dict[str, Any]]]:
+    """Lê o CSV em blocos de `chunksize` linhas e limpa cada bloco isoladamente.
 
-def load_and_clean_srag(csv_path: Path) -> pd.DataFrame:
-    df = pd.read_csv(csv_path, dtype=str, low_memory=False)
+    Só as colunas estreitas de cada bloco limpo ficam em memória, então o pico
+    é proporcional ao bloco mais a saída. A conversão de cada valor não
+    depende do bloco em que ele cai, então o resultado é idêntico ao da
+    leitura integral.
+    """
 
-    audit("load_csv", {"path": str(csv_path), "rows_read": int(len(df))})
+    stats = _new_clean_stats()
 
+    frames: List[pd.DataFrame] = []
+
+    rows_read = 0
+
+    for chunk in pd.read_csv(source, chunksize=chunksize, **read_kwargs):
+        rows_read += len(chunk)
+
+        frames.append(_clean_frame(chunk, stats))
+
+    if not frames:
+        empty = pd.DataFrame(columns=read_kwargs["usecols"] or [], dtype=object)
+
+        return _clean_frame(empty, stats), 0, stats
+
+    return _concat_frames(frames), rows_read, stats
+
+
+def _new_clean_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        "dates": {},
+        "memory": {"before": {}, "after": {}},
+        "quality": new_quality_profile(),
+    }
+
+
+def _add_memory(
+    acc: Dict[str, int], df: pd.DataFrame, sample_rows: Optional[int] = None
+) -> None:
+    """Soma em `acc` a memória (deep) de cada coluna de `df`.
+
+    Com `sample_rows`, as colunas de texto (object), as únicas caras de medir,
+    são medidas em até esse número de linhas espaçadas e extrapoladas para o
+    bloco inteiro.
+    """
+
+    step = -(-len(df) // sample_rows) if sample_rows else 1
+
+    for c in df.columns:
+        s = df[c]
+
+        if step > 1 and s.dtype == object:
+            sample = s.iloc[::step]
+
+            n = sample.memory_usage(deep=True, index=False) * len(s) / len(sample)
+
+        else:
+            n = s.memory_usage(deep=True, index=False)
+
+        acc[c] = acc.get(c, 0) + int(round(n))
+
+
+def _merge_date_stats(
+    date_stats: Dict[str, Dict[str, Any]], col: str, stats: Dict[str, Any]
+) -> None:
+    if col not in date_stats:
+        date_stats[col] = dict(stats)
+
+        return
+
+    acc = date_stats[col]
+
+    if acc["format"] == "unknown":
+        acc["format"] = stats["format"]
+
+    elif stats["format"] not in ("unknown", acc["format"]):
+        acc["format"] = "mixed"
+
+    for key in ("fast", "fallback", "unparsed"):
+        acc[key] += stats[key]
+
+
+def _clean_frame(df: pd.DataFrame, stats: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
     df.columns = _normalize_columns(df.columns.tolist())
 
     present = [c for c in RELEVANT_COLUMNS if c in df.columns]
@@ -34,42 +610,74 @@ def load_and_clean_srag(csv_path: Path) -> pd.DataFrame:
     if present:
         df = df[present].copy()
 
-    for date_col in ["dt_sin_pri", "dt_notific", "dt_interna"]:
+    had_date = raw_date_mask(df, DATE_COLUMNS)
+
+    profile_raw_chunk(df, stats["quality"])
+
+    df = _derive_case_columns(df, stats)
+
+    profile_clean_chunk(df, had_date, DATE_COLUMNS, stats["quality"])
+
+    df["age_band"] = _age_band(df)
+
+    for f in SENSITIVE_FIELDS:
+        if f in df.columns:
+            df[f] = None
+
+    _add_memory(stats["memory"]["before"], df, MEMORY_SAMPLE_ROWS)
+
+    df = _compact_frame(df)
+
+    _add_memory(stats["memory"]["after"], df)
+
+    return df
+
+
+def derive_case_frame(
+    chunk: pd.DataFrame, stats: Optional[Dict[str, Dict[str, Any]]] = None
+) -> pd.DataFrame:
+    """Deriva `case_date` e os indicadores de um bloco bruto, com as flags tipadas.
+
+    Normaliza os nomes das colunas e aplica as mesmas regras da limpeza
+    completa (`_derive_case_columns` e `_cast_flags`), sem os passos que só
+    o DataFrame limpo precisa; usado pelas métricas em fluxo.
+    """
+
+    chunk.columns = _normalize_columns(chunk.columns.tolist())
+
+    return _cast_flags(_derive_case_columns(chunk, stats or _new_clean_stats()))
+
+
+def _derive_case_columns(
+    df: pd.DataFrame, stats: Dict[str, Dict[str, Any]]
+) -> pd.DataFrame:
+    """Converte as datas e deriva `case_date` e os indicadores de UTI, óbito e vacina.
+
+    Linhas sem nenhuma data válida são descartadas. Compartilhado pela limpeza
+    completa e pelas métricas em fluxo (`derive_case_frame`), para que as
+    regras sejam as mesmas.
+    """
+
+    for date_col in DATE_COLUMNS:
         if date_col in df.columns:
-            df[date_col] = _parse_date(df[date_col])
+            df[date_col], col_stats = parse_date_column(df[date_col])
+
+            _merge_date_stats(stats["dates"], date_col, col_stats)
 
     df["case_date"] = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
 
-    for date_col in ["dt_sin_pri", "dt_notific", "dt_interna"]:
+    for date_col in DATE_COLUMNS:
         if date_col in df.columns:
             df["case_date"] = df["case_date"].combine_first(df[date_col])
 
     if "uti" in df.columns:
-        df["icu_flag"] = (
-            df["uti"]
-            .astype(str)
-            .str.strip()
-            .str.upper()
-            .isin(["1", "SIM", "YES", "Y", "TRUE"])
-        )
+        df["icu_flag"] = flag_from_codes(df["uti"], is_icu_code)
 
     else:
         df["icu_flag"] = False
 
-    death_predicates = [
-        lambda s: s.astype(str).str.strip() == "2",
-        lambda s: s.astype(str).str.upper().str.contains("OBITO", na=False),
-        lambda s: s.astype(str).str.upper().str.contains("ÓBITO", na=False),
-        lambda s: s.astype(str).str.upper().str.contains("DEATH", na=False),
-    ]
-
     if "evolucao" in df.columns:
-        death_series = pd.Series(False, index=df.index)
-
-        for pred in death_predicates:
-            death_series = death_series | pred(df["evolucao"])
-
-        df["death_flag"] = death_series
+        df["death_flag"] = flag_from_codes(df["evolucao"], is_death_code)
 
     else:
         df["death_flag"] = False
@@ -80,9 +688,7 @@ def load_and_clean_srag(csv_path: Path) -> pd.DataFrame:
         vac = None
 
         for c in vac_sources:
-            col = df[c].astype(str).str.strip().str.upper()
-
-            flag = col.isin(["1", "SIM", "YES", "Y", "TRUE"])
+            flag = flag_from_codes(df[c], is_vaccinated_code)
 
             vac = flag if vac is None else (vac | flag)
 
@@ -98,17 +704,80 @@ def load_and_clean_srag(csv_path: Path) -> pd.DataFrame:
 
         df = df[~df["case_date"].isna()].copy()
 
-    for f in SENSITIVE_FIELDS:
-        if f in df.columns:
-            df[f] = None
+    return df
 
-    audit(
-        "clean_csv",
-        {
-            "path": str(csv_path),
-            "rows_after_clean": int(len(df)),
-            "sensitive_cleared": SENSITIVE_FIELDS,
-        },
-    )
+
+def _age_band_labels() -> List[str]:
+    edges = AGE_BAND_EDGES
+
+    labels = [f"{lo}-{hi - 1}" for lo, hi in zip(edges, edges[1:])]
+
+    return labels + [f"{edges[-1]}+"] if edges else labels
+
+
+def _age_band(df: pd.DataFrame) -> pd.Series:
+    """Faixa etária (AGE_BAND_EDGES) a partir de NU_IDADE_N e TP_IDADE.
+
+    TP_IDADE 1 (dias) e 2 (meses) contam como 0 anos; sem TP_IDADE, a idade é
+    lida em anos. Só a faixa sobrevive à remoção dos campos sensíveis.
+    """
+
+    labels = _age_band_labels()
+
+    if "nu_idade_n" not in df.columns or not labels:
+        return pd.Series(
+            pd.Categorical([None] * len(df), categories=labels), index=df.index
+        )
+
+    age = pd.to_numeric(df["nu_idade_n"], errors="coerce")
+
+    if "tp_idade" in df.columns:
+        unit = pd.to_numeric(df["tp_idade"], errors="coerce")
+
+        age = age.mask(unit.isin([1, 2]) & age.notna(), 0)
+
+    bins = list(AGE_BAND_EDGES) + [np.inf]
+
+    return pd.cut(age, bins=bins, right=False, labels=labels)
+
+
+def _compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Reduz o DataFrame limpo a um esquema compacto.
+
+    Campos sensíveis (já anulados) são removidos, códigos viram categóricas,
+    `vaccinated_flag` vira booleano anulável (NA = vacinação desconhecida) e
+    os demais indicadores ficam em bool.
+    """
+
+    df = df.drop(columns=[f for f in SENSITIVE_FIELDS if f in df.columns])
+
+    for c in CODED_COLUMNS:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+
+    return _cast_flags(df)
+
+
+def _restore_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """Refaz as categóricas de um DataFrame limpo lido do Parquet.
+
+    Uma coluna de código toda nula vira categórica sem categorias, que o
+    Parquet grava como tipo nulo e devolve como object; sem isso, um acerto
+    do cache teria esquema diferente da limpeza recém-feita.
+    """
+
+    for c in CODED_COLUMNS:
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+
+    return df
+
+
+def _cast_flags(df: pd.DataFrame) -> pd.DataFrame:
+    df["icu_flag"] = df["icu_flag"].astype(bool)
+
+    df["death_flag"] = df["death_flag"].astype(bool)
+
+    df["vaccinated_flag"] = df["vaccinated_flag"].astype("boolean")
 
     return df
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from contextlib import ExitStack
+
+from pathlib import Path
+
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple, Union
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    import duckdb
+
+from src.configuracao import (
+    DEATH_CODES,
+    DEATH_KEYWORDS,
+    DUCKDB_MEMORY_LIMIT,
+    DUCKDB_THREADS,
+    ICU_CODES,
+    VACCINATED_CODES,
+)
+
+from src.dados.ingestao import (
+    canonical_columns,
+    is_compressed_source,
+    open_srag_stream,
+    sniff_csv_layout,
+)
+
+from src.dados.datas import DATE_FORMATS
+
+from src.dados.limpeza import DATE_COLUMNS
+
+from src.governance import audit
+
+from src.relatorio.agregados import CUBE_COLUMNS, empty_daily_cube
+
+from src.relatorio.metricas import compute_metrics_from_cube
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _in_list(values: List[str]) -> str:
+    return "(" + ", ".join(_literal(v) for v in values) + ")" if values else "(NULL)"
+
+
+def _code_expr(raw: str) -> str:
+    # Mesma normalização de src.dados.codigos.normalize_code; ausentes viram "NAN".
+    return (
+        f"COALESCE(regexp_replace(upper(trim({_ident(raw)})), "
+        f"'^(\\d+)\\.0+$', '\\1'), 'NAN')"
+    )
+
+
+# Datas fora do intervalo de datetime64[ns] (anos digitados errado, como 0202)
+# viram NULL, como o NaT da limpeza em pandas, e o COALESCE segue para a
+# próxima coluna de data.
+_MIN_DATE = pd.Timestamp.min.ceil("D").date().isoformat()
+
+_MAX_DATE = pd.Timestamp.max.floor("D").date().isoformat()
+
+
+def _date_expr(raw: str) -> str:
+    q = _ident(raw)
+
+    # Os mesmos formatos, na mesma ordem, de `parse_date_column`.
+    formats = "[" + ", ".join(_literal(f) for f in DATE_FORMATS) + "]"
+
+    parsed = f"TRY_STRPTIME(trim({q}), {formats})"
+
+    return (
+        f"CASE WHEN {parsed} BETWEEN TIMESTAMP '{_MIN_DATE}' "
+        f"AND TIMESTAMP '{_MAX_DATE}' THEN {parsed} END"
+    )
+
+
+def _text_expr(raw: str, column_type: str) -> str:
+    q = _ident(raw)
+
+    if column_type == "DATE" or column_type.startswith("TIMESTAMP"):
+        return f"strftime({q}, '%Y-%m-%d %H:%M:%S')"
+
+    return f"CAST({q} AS VARCHAR)"
+
+
+def _cleaned_select(columns: Dict[str, str], source: str) -> str:
+    """SELECT com case_date e indicadores derivados, a partir de `source`.
+
+    `columns` mapeia o nome canônico para o nome bruto na fonte.
+    """
+
+    dates = [_date_expr(columns[c]) for c in DATE_COLUMNS if c in columns]
+
+    case_date = f"COALESCE({', '.join(dates)})" if dates else "NULL::TIMESTAMP"
+
+    icu = (
+        f"{_code_expr(columns['uti'])} IN {_in_list(ICU_CODES)}"
+        if "uti" in columns
+        else "FALSE"
+    )
+
+    if "evolucao" in columns:
+        code = _code_expr(columns["evolucao"])
+
+        death_terms = [f"{code} IN {_in_list(DEATH_CODES)}"] + [
+            f"contains({code}, {_literal(k)})" for k in DEATH_KEYWORDS
+        ]
+
+        death = "(" + " OR ".join(death_terms) + ")"
+
+    else:
+        death = "FALSE"
+
+    vac_sources = [c for c in ["vacina_cov", "vacina"] if c in columns]
+
+    vac_terms = [
+        f"{_code_expr(columns[c])} IN {_in_list(VACCINATED_CODES)}" for c in vac_sources
+    ]
+
+    vaccinated = "(" + " OR ".join(vac_terms) + ")" if vac_terms else "FALSE"
+
+    return (
+        f"SELECT {case_date} AS case_date, {icu} AS icu_flag, "
+        f"{death} AS death_flag, {vaccinated} AS vaccinated_flag, "
+        f"{'TRUE' if vac_sources else 'FALSE'} AS vaccination_known "
+        f"FROM {source}"
+    )
+
+
+def _register_source(
+    con: duckdb.DuckDBPyConnection, path: Path, name: str, stack: ExitStack
+) -> Dict[str, str]:
+    """Registra a fonte como a view `name` e retorna o mapa canônico -> bruto.
+
+    Fluxos abertos para a consulta ficam em `stack` até o fim da conexão.
+    """
+
+    if path.suffix.lower() == ".parquet":
+        source = f"read_parquet({_literal(str(path))})"
+
+        described = con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+
+        types = {d[0]: d[1] for d in described}
+
+        columns = canonical_columns(list(types))
+
+        # As expressões de datas e códigos esperam texto, como no CSV; Parquet
+        # tipado (o cache dos dados limpos, por exemplo) é projetado como texto.
+        projection = ", ".join(
+            f"{_text_expr(raw, types[raw])} AS {_ident(raw)}"
+            for raw in columns.values()
+        )
+
+        con.execute(f"CREATE VIEW {name} AS SELECT {projection or '*'} FROM {source}")
+
+        return columns
+
+    layout = sniff_csv_layout(path)
+
+    columns = layout["canonical"]
+
+    if layout["encoding"] == "utf-8" and not is_compressed_source(path):
+        con.execute(
+            f"CREATE VIEW {name} AS SELECT * FROM read_csv("
+            f"{_literal(str(path))}, delim={_literal(layout['sep'])}, "
+            "header=true, all_varchar=true)"
+        )
+
+        return columns
+
+    # O leitor CSV do DuckDB só aceita UTF-8 e não abre .zip; arquivos latin-1
+    # e comprimidos do DATASUS são decodificados em fluxo pelo pyarrow, só com
+    # as colunas usadas.
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    raw = list(columns.values())
+
+    reader = pa_csv.open_csv(
+        stack.enter_context(open_srag_stream(path)),
+        read_options=pa_csv.ReadOptions(encoding=layout["encoding"]),
+        parse_options=pa_csv.ParseOptions(delimiter=layout["sep"]),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=raw,
+            column_types={c: pa.string() for c in raw},
+            strings_can_be_null=True,
+        ),
+    )
+
+    con.register(name, reader)
+
+    return columns
+
+
+def run_duckdb_engine(paths: Union[Path, Sequence[Path]]) -> Tuple[dict, pd.DataFrame]:
+    """Calcula as métricas centrais com DuckDB, direto sobre o CSV ou Parquet.
+
+    Seleção de colunas, datas, indicadores e a agregação diária rodam em SQL
+    com varredura paralela, sem carregar as linhas no pandas. Aceita um arquivo
+    ou uma lista (um por ano), unidos com UNION ALL. Retorna o mesmo dicionário
+    de `compute_core_metrics` e o cubo diário (`build_daily_cube`), que
+    alimenta os gráficos.
+    """
+
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    paths = [Path(p) for p in paths]
+
+    # duckdb só é importado quando o motor é escolhido (--engine duckdb).
+    import duckdb
+
+    con = duckdb.connect()
+
+    stack = ExitStack()
+
+    try:
+        if DUCKDB_THREADS:
+            con.execute(f"SET threads = {int(DUCKDB_THREADS)}")
+
+        if DUCKDB_MEMORY_LIMIT:
+            con.execute(f"SET memory_limit = {_literal(DUCKDB_MEMORY_LIMIT)}")
+
+        selects = []
+
+        columns_used = set()
+
+        for i, path in enumerate(paths):
+            columns = _register_source(con, path, f"src_{i}", stack)
+
+            columns_used.update(columns)
+
+            selects.append(_cleaned_select(columns, f"src_{i}"))
+
+        cleaned_sql = " UNION ALL ".join(selects)
+
+        # Uma única varredura da fonte: o cubo diário (uma linha por dia).
+        daily = con.execute(
+            "SELECT CAST(case_date AS DATE) AS case_date, count(*) AS cases, "
+            "count(*) FILTER (WHERE death_flag) AS deaths, "
+            "count(*) FILTER (WHERE icu_flag) AS icu, "
+            "count(*) FILTER (WHERE vaccination_known) AS vaccination_known, "
+            "count(*) FILTER (WHERE vaccinated_flag) AS vaccinated "
+            f"FROM ({cleaned_sql}) "
+            "WHERE case_date IS NOT NULL GROUP BY 1 ORDER BY 1"
+        ).df()
+
+    finally:
+        con.close()
+
+        stack.close()
+
+    cube = empty_daily_cube()
+
+    if len(daily):
+        cube = pd.DataFrame(
+            {c: daily[c].to_numpy(dtype="int64") for c in CUBE_COLUMNS},
+            index=pd.DatetimeIndex(
+                pd.to_datetime(daily["case_date"]).astype("datetime64[ns]"),
+                name="case_date",
+            ),
+        )
+
+    metrics = compute_metrics_from_cube(cube)
+
+    audit(
+        "duckdb_engine",
+        {
+            "paths": [str(p) for p in paths],
+            "columns_used": sorted(columns_used),
+            "days": int(len(cube)),
+            "cases": int(cube["cases"].sum()),
+        },
+    )
+
+    return metrics, cube
@@ -0,0 +1,115 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+from src.configuracao import STREAM_CHUNKSIZE
+from src.dados.ingestao import (
+    open_srag_stream,
+    read_with_encoding_retry,
+    sniff_csv_layout,
+)
+from src.dados.limpeza import DATE_COLUMNS, derive_case_frame
+from src.governance import audit
+from src.relatorio.agregados import CUBE_COLUMNS, cube_weights
+from src.relatorio.metricas import _metrics_dict, reference_date
+from src.relatorio.registro import WINDOWS, evaluate_metrics
+
+
+# Colunas brutas de que as métricas dependem (datas e códigos dos indicadores).
+STREAM_COLUMNS = DATE_COLUMNS + ["uti", "evolucao", "vacina", "vacina_cov"]
+
+Counters = Dict[str, Dict[str, int]]
+
+
+def _new_counters() -> Counters:
+    return {window: {c: 0 for c in CUBE_COLUMNS} for window in WINDOWS}
+
+
+def _stream_usecols(layout: dict):
+    if layout["usecols"] is None:
+        return None
+    return [raw for c, raw in layout["canonical"].items() if c in STREAM_COLUMNS]
+
+
+def _count_chunk(chunk: pd.DataFrame, today: np.datetime64, counters: Counters) -> int:
+    """Soma a contribuição de um bloco bruto aos contadores de cada janela."""
+    df = derive_case_frame(chunk)
+    days = df["case_date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    days_back = (today - days).astype(np.int64)
+    weights = cube_weights(df)
+    for window, (start, end) in WINDOWS.items():
+        # Janela [as_of - start, as_of - end): end < dias de distância <= start.
+        mask = (days_back > end) & (days_back <= start)
+        for c in CUBE_COLUMNS:
+            counters[window][c] += int(weights[c][mask].sum())
+    return int(len(df))
+
+
+def _stream_file(
+    path: Path, layout: dict, today: np.datetime64, chunksize: int
+) -> tuple:
+    counters = _new_counters()
+    rows_read = rows_used = 0
+    with open_srag_stream(path) as source:
+        reader = pd.read_csv(
+            source,
+            sep=layout["sep"],
+            encoding=layout["encoding"],
+            usecols=_stream_usecols(layout),
+            dtype=str,
+            chunksize=chunksize,
+        )
+        for chunk in reader:
+            rows_read += len(chunk)
+            rows_used += _count_chunk(chunk, today, counters)
+    return counters, rows_read, rows_used
+
+
+def stream_core_metrics(
+    paths: Union[Path, Sequence[Path]],
+    as_of=None,
+    chunksize: Optional[int] = None,
+) -> dict:
+    """Métricas registradas lidas direto do(s) CSV(s), sem montar o DataFrame limpo.
+
+    Cada bloco de `chunksize` linhas (padrão: STREAM_CHUNKSIZE) traz só as
+    colunas de datas e indicadores, passa pelas mesmas regras de
+    `limpeza.py` e é somado a contadores por janela relativos a `as_of`; o
+    bloco é descartado em seguida, então a memória não cresce com o
+    arquivo. O resultado é idêntico ao de `compute_core_metrics` sobre os
+    dados limpos.
+    """
+    paths = [Path(paths)] if isinstance(paths, (str, Path)) else list(paths)
+    chunksize = chunksize or STREAM_CHUNKSIZE
+    now = reference_date(as_of)
+    today = np.datetime64(now.date(), "D")
+
+    totals = _new_counters()
+    rows_read = rows_used = 0
+    for path in paths:
+        counters, read, used = read_with_encoding_retry(
+            lambda layout: _stream_file(path, layout, today, chunksize),
+            sniff_csv_layout(path),
+        )
+        for window, columns in counters.items():
+            for c, n in columns.items():
+                totals[window][c] += n
+        rows_read += read
+        rows_used += used
+
+    values = evaluate_metrics(
+        lambda window, column: np.array([totals[window][column]], dtype=np.int64)
+    )
+
+    audit(
+        "stream_metrics",
+        {
+            "paths": [str(p) for p in paths],
+            "rows_read": rows_read,
+            "rows_used": rows_used,
+            "chunksize": chunksize,
+        },
+    )
+    return _metrics_dict(values, now)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+import pandas as pd
+
+
+from src.configuracao import QUALITY_MAX_CODES, QUALITY_MIN_DATE
+
+from src.dados.codigos import normalize_code
+
+
+# Colunas de código cuja distribuição entra no perfil.
+PROFILED_CODE_COLUMNS = ["evolucao", "uti", "vacina", "vacina_cov"]
+
+# Rótulos de valores ausentes e da cauda agregada nas distribuições.
+MISSING_CODE = "<vazio>"
+
+OTHER_CODES = "<outros>"
+
+
+def new_quality_profile() -> Dict[str, Any]:
+    return {
+        "rows_read": 0,
+        "rows_kept": 0,
+        "dropped": {"missing_dates": 0, "unparseable_dates": 0},
+        "nulls": {},
+        "unparseable": {},
+        "codes": {},
+        "out_of_range_dates": {},
+    }
+
+
+def add_counts(acc: Dict[str, Any], counts: Dict[str, Any]) -> None:
+    """Soma `counts` em `acc`, recursivamente, para dicts de contagens."""
+
+    for key, value in counts.items():
+        if isinstance(value, dict):
+            add_counts(acc.setdefault(key, {}), value)
+
+        else:
+            acc[key] = acc.get(key, 0) + value
+
+
+def merge_quality_profiles(profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Une perfis de arquivos ou trechos diferentes somando as contagens."""
+
+    merged = new_quality_profile()
+
+    for profile in profiles:
+        add_counts(merged, profile)
+
+    return _cap_codes(merged)
+
+
+def raw_date_mask(df: pd.DataFrame, date_columns: List[str]) -> np.ndarray:
+    """Linhas com algum valor bruto (ainda em texto) nas colunas de data."""
+
+    present = np.zeros(len(df), dtype=bool)
+
+    for c in date_columns:
+        if c in df.columns:
+            present |= df[c].notna().to_numpy()
+
+    return present
+
+
+def profile_raw_chunk(df: pd.DataFrame, profile: Dict[str, Any]) -> None:
+    """Conta nulos por coluna e a distribuição dos códigos de um bloco bruto."""
+
+    profile["rows_read"] += len(df)
+
+    add_counts(profile["nulls"], {c: int(df[c].isna().sum()) for c in df.columns})
+
+    for c in PROFILED_CODE_COLUMNS:
+        if c not in df.columns:
+            continue
+
+        cat = df[c].astype("category")
+
+        counts = np.bincount(
+            cat.cat.codes.to_numpy() + 1, minlength=len(cat.cat.categories) + 1
+        )
+
+        dist: Dict[str, int] = {}
+
+        if counts[0]:
+            dist[MISSING_CODE] = int(counts[0])
+
+        for category, n in zip(cat.cat.categories, counts[1:]):
+            if n:
+                code = normalize_code(category)
+
+                dist[code] = dist.get(code, 0) + int(n)
+
+        add_counts(profile["codes"].setdefault(c, {}), dist)
+
+
+def profile_clean_chunk(
+    df: pd.DataFrame,
+    had_date: np.ndarray,
+    date_columns: List[str],
+    profile: Dict[str, Any],
+) -> None:
+    """Conta as linhas descartadas por regra e as datas fora do intervalo.
+
+    `had_date` é `raw_date_mask` do bloco antes da limpeza: linhas sem
+    nenhuma data somam em `missing_dates`; as demais descartadas tinham datas,
+    mas nenhuma reconhecida (`unparseable_dates`).
+    """
+
+    missing = int((~had_date).sum())
+
+    dropped = len(had_date) - len(df)
+
+    profile["rows_kept"] += len(df)
+
+    profile["dropped"]["missing_dates"] += missing
+
+    profile["dropped"]["unparseable_dates"] += dropped - missing
+
+    low = np.datetime64(QUALITY_MIN_DATE, "D")
+
+    high = np.datetime64(datetime.utcnow().date(), "D")
+
+    for c in date_columns:
+        if c not in df.columns:
+            continue
+
+        days = df[c].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+
+        add_counts(
+            profile["out_of_range_dates"].setdefault(c, {}),
+            {"before_min": int((days < low).sum()), "future": int((days > high).sum())},
+        )
+
+
+def finalize_quality_profile(
+    profile: Dict[str, Any], date_stats: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Completa o perfil com as datas não reconhecidas e limita as distribuições."""
+
+    profile["unparseable"] = {c: s["unparsed"] for c, s in date_stats.items()}
+
+    return _cap_codes(profile)
+
+
+def quality_profile(df: pd.DataFrame) -> Dict[str, Any]:
+    """Perfil de qualidade gravado pela limpeza em `df.attrs` (vazio se ausente)."""
+
+    return df.attrs.get("quality", {})
+
+
+def _cap_codes(profile: Dict[str, Any]) -> Dict[str, Any]:
+    for c, dist in profile["codes"].items():
+        top = sorted(dist.items(), key=lambda kv: (-kv[1], kv[0]))
+
+        kept = dict(top[:QUALITY_MAX_CODES])
+
+        rest = sum(n for _, n in top[QUALITY_MAX_CODES:])
+
+        if rest:
+            kept[OTHER_CODES] = kept.get(OTHER_CODES, 0) + rest
+
+        profile["codes"][c] = kept
+
+    return profile
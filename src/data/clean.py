@@ -1,3 +1,3 @@
-from src.dados.limpeza import load_and_clean_srag
+from src.dados.limpeza import load_and_clean_many, load_and_clean_srag
 
-__all__ = ["load_and_clean_srag"]
+__all__ = ["load_and_clean_many", "load_and_clean_srag"]
@@ -0,0 +1,3 @@
+from src.dados.motor_duckdb import run_duckdb_engine
+
+__all__ = ["run_duckdb_engine"]
@@ -1,3 +1,3 @@
-from src.dados.ingestao import ensure_srag_csv
+from src.dados.ingestao import discover_srag_csvs, ensure_srag_csv
 
-__all__ = ["ensure_srag_csv"]
+__all__ = ["discover_srag_csvs", "ensure_srag_csv"]
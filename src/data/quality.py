@@ -0,0 +1,3 @@
+from src.dados.qualidade import merge_quality_profiles, quality_profile
+
+__all__ = ["merge_quality_profiles", "quality_profile"]
@@ -0,0 +1,3 @@
+from src.dados.motor_streaming import stream_core_metrics
+
+__all__ = ["stream_core_metrics"]
@@ -32,17 +32,13 @@ from src.configuracao import PSEUDONYMIZE_MODE
 
 from src.token_service import tokenize
 
-from src.configuracao import S3_ARCHIVE_BUCKET, S3_ARCHIVE_PREFIX
-
-import boto3
-
-from botocore.exceptions import BotoCoreError, ClientError
+from src.configuracao import S3_ARCHIVE_BUCKET, S3_ARCHIVE_PREFIX, ensure_dir
 
 
 def _ensure_paths():
-    AUDIT_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(AUDIT_LOG_PATH.parent)
 
-    DECISIONS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(DECISIONS_PATH.parent)
 
 
 def audit(event: str, details: Dict[str, Any] | None = None) -> None:
@@ -85,11 +81,16 @@ def audit(event: str, details: Dict[str, Any] | None = None) -> None:
             if AUDIT_LOG_PATH.stat().st_size > AUDIT_MAX_BYTES:
                 ts = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
 
-                target = ARCHIVE_DIR / f"audit.{ts}.log"
+                target = ensure_dir(ARCHIVE_DIR) / f"audit.{ts}.log"
 
                 shutil.move(str(AUDIT_LOG_PATH), str(target))
 
                 if S3_ARCHIVE_BUCKET:
+                    # boto3/botocore só são importados quando há envio ao S3.
+                    import boto3
+
+                    from botocore.exceptions import BotoCoreError, ClientError
+
                     client = boto3.client("s3")
 
                     key = f"{S3_ARCHIVE_PREFIX}audit.{ts}.log"
@@ -0,0 +1,60 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+
+# Colunas do cubo diário, na ordem em que são gravadas.
+CUBE_COLUMNS = ["cases", "deaths", "icu", "vaccination_known", "vaccinated"]
+
+
+def empty_daily_cube() -> pd.DataFrame:
+    index = pd.DatetimeIndex([], dtype="datetime64[ns]", name="case_date")
+    return pd.DataFrame(
+        {c: np.zeros(0, dtype=np.int64) for c in CUBE_COLUMNS}, index=index
+    )
+
+
+def cube_weights(df: pd.DataFrame) -> dict:
+    """Contribuição (0/1) de cada linha para cada coluna de CUBE_COLUMNS."""
+    ones = np.ones(len(df), dtype=np.int64)
+    zeros = np.zeros(len(df), dtype=np.int64)
+    weights = {"cases": ones}
+    for name, column in [("deaths", "death_flag"), ("icu", "icu_flag")]:
+        col = df.get(column)
+        weights[name] = zeros if col is None else col.to_numpy(dtype=np.int64)
+    vaccinated = df.get("vaccinated_flag")
+    if vaccinated is None:
+        weights["vaccination_known"] = weights["vaccinated"] = zeros
+    else:
+        weights["vaccination_known"] = vaccinated.notna().to_numpy(dtype=np.int64)
+        weights["vaccinated"] = vaccinated.fillna(False).to_numpy(dtype=np.int64)
+    return {name: weights[name] for name in CUBE_COLUMNS}
+
+
+def build_daily_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrega o DataFrame limpo em uma linha por dia de `case_date`.
+
+    Colunas: casos, óbitos, UTI, vacinação conhecida e vacinados (CUBE_COLUMNS),
+    em int64; o índice é o dia, ordenado, só com dias que têm casos. Feito numa
+    única passada (fatoração do dia + bincount), é a entrada comum de métricas
+    e gráficos, com poucas centenas de linhas por ano de dados.
+    """
+    if "case_date" not in df.columns:
+        raise ValueError("DataFrame sem coluna 'case_date' após limpeza")
+
+    dates = df["case_date"].to_numpy(dtype="datetime64[ns]")
+    keep = ~np.isnat(dates)
+    if not keep.all():
+        df, dates = df.loc[keep], dates[keep]
+    if len(dates) == 0:
+        return empty_daily_cube()
+
+    codes, days = pd.factorize(dates.astype("datetime64[D]"), sort=True)
+
+    data = {
+        name: np.bincount(codes, weights=w, minlength=len(days)).astype(np.int64)
+        for name, w in cube_weights(df).items()
+    }
+
+    index = pd.DatetimeIndex(days.astype("datetime64[ns]"), name="case_date")
+    return pd.DataFrame(data, index=index)
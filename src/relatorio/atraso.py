@@ -0,0 +1,153 @@
+from __future__ import annotations
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+from src.configuracao import DELAY_MAX_DAYS
+from src.relatorio.metricas import reference_date
+from src.relatorio.registro import METRIC_REGISTRY, WINDOWS
+from src.relatorio.semana_epi import epi_week_start, epi_weeks
+
+
+def build_delay_matrix(
+    df: pd.DataFrame, max_delay: Optional[int] = None
+) -> pd.DataFrame:
+    """Histograma do atraso sintomas -> notificação por dia de início dos sintomas.
+
+    Uma linha por dia de `dt_sin_pri` e uma coluna por atraso em dias, de 0 a
+    `max_delay` (padrão: DELAY_MAX_DAYS; a última coluna acumula os atrasos
+    maiores). Só entram casos com as duas datas e atraso não negativo. Feito
+    numa única passada (fatoração do dia + bincount sobre dia x atraso), é o
+    triângulo de notificação usado no ajuste de completude.
+    """
+    if max_delay is None:
+        max_delay = DELAY_MAX_DAYS
+    width = max_delay + 1
+    columns = pd.RangeIndex(width, name="delay")
+
+    onset = _column_days(df, "dt_sin_pri")
+    notified = _column_days(df, "dt_notific")
+    valid = ~np.isnat(onset) & ~np.isnat(notified)
+    delay = (notified[valid] - onset[valid]).astype(np.int64)
+    onset = onset[valid][delay >= 0]
+    delay = delay[delay >= 0]
+
+    if len(onset) == 0:
+        index = pd.DatetimeIndex([], dtype="datetime64[ns]", name="onset_date")
+        return pd.DataFrame(np.zeros((0, width), dtype=np.int64), index, columns)
+
+    codes, days = pd.factorize(onset, sort=True)
+    flat = codes * width + np.minimum(delay, max_delay)
+    counts = np.bincount(flat, minlength=len(days) * width).reshape(-1, width)
+
+    index = pd.DatetimeIndex(days.astype("datetime64[ns]"), name="onset_date")
+    return pd.DataFrame(counts.astype(np.int64), index=index, columns=columns)
+
+
+def _column_days(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in df.columns:
+        return np.full(len(df), np.datetime64("NaT"), dtype="datetime64[D]")
+    return df[column].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+
+
+def delay_histogram_by_week(matrix: pd.DataFrame) -> pd.DataFrame:
+    """Soma o triângulo de `build_delay_matrix` por semana epidemiológica do início.
+
+    Retorna uma linha por SE com `epi_year`, `epi_week`, `week_start` e as
+    colunas de atraso.
+    """
+    days = matrix.index.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    starts = epi_week_start(days)
+    codes, weeks = pd.factorize(starts, sort=True)
+    values = matrix.to_numpy(dtype=np.int64)
+    sums = np.zeros((len(weeks), values.shape[1]), dtype=np.int64)
+    np.add.at(sums, codes, values)
+
+    year, week = epi_weeks(weeks)
+    table = pd.DataFrame(sums, columns=matrix.columns)
+    table.insert(0, "week_start", weeks.astype("datetime64[ns]"))
+    table.insert(0, "epi_week", week)
+    table.insert(0, "epi_year", year)
+    return table
+
+
+def reporting_completeness(matrix: pd.DataFrame, as_of=None) -> np.ndarray:
+    """Fração acumulada dos casos notificados até d dias após os sintomas.
+
+    Estimada só com os dias de início já maduros (mais de `max_delay` dias
+    antes de `as_of`), cujas notificações estão completas. Retorna um vetor
+    indexado pelo atraso; zeros quando não há histórico maduro.
+    """
+    width = matrix.shape[1]
+    now = np.datetime64(reference_date(as_of).date(), "D")
+    days = matrix.index.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    mature = (now - days).astype(np.int64) > width - 1
+
+    hist = matrix.to_numpy(dtype=np.int64)[mature].sum(axis=0)
+    total = hist.sum()
+    if total == 0:
+        return np.zeros(width, dtype=np.float64)
+    return np.cumsum(hist) / total
+
+
+def completeness_adjusted_series(
+    cube: pd.DataFrame, matrix: pd.DataFrame, as_of=None
+) -> pd.Series:
+    """Casos diários do cubo divididos pela completude esperada em `as_of`.
+
+    Um dia com início dos sintomas `k` dias antes de `as_of` só pode ter as
+    notificações com atraso até `k - 1`; sua contagem é dividida por
+    `reporting_completeness[k - 1]`. Dias maduros, futuros ou sem estimativa
+    de completude ficam com a contagem original. Pressupõe que os dados
+    foram extraídos em `as_of`.
+    """
+    now = np.datetime64(reference_date(as_of).date(), "D")
+    completeness = reporting_completeness(matrix, as_of)
+    width = len(completeness)
+
+    days = cube.index.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    lag = (now - days).astype(np.int64) - 1
+    factor = np.ones(len(days), dtype=np.float64)
+    recent = (lag >= 0) & (lag < width - 1)
+    factor[recent] = completeness[lag[recent]]
+    factor[factor <= 0] = 1.0
+
+    cases = cube["cases"].to_numpy(dtype=np.float64)
+    return pd.Series(cases / factor, index=cube.index, name="cases_adjusted")
+
+
+def completeness_adjusted_metrics(
+    cube: pd.DataFrame, matrix: pd.DataFrame, as_of=None
+) -> dict:
+    """Contagens de 7 dias ajustadas pela completude, ao lado das originais.
+
+    Retorna `last7_cases_adjusted`, `prev7_cases_adjusted`,
+    `case_increase_rate_adjusted` (mesma definição do registro) e
+    `last7_completeness` (casos observados / ajustados).
+    """
+    now = reference_date(as_of)
+    adjusted = completeness_adjusted_series(cube, matrix, now)
+    days = adjusted.index.to_numpy(dtype="datetime64[ns]")
+    today = np.datetime64(now.date(), "D").astype("datetime64[ns]")
+
+    sums = {}
+    for window in ("last7", "prev7"):
+        start, end = WINDOWS[window]
+        mask = (days >= today - np.timedelta64(start, "D")) & (
+            days < today - np.timedelta64(end, "D")
+        )
+        sums[window] = (
+            float(adjusted.to_numpy()[mask].sum()),
+            int(cube["cases"].to_numpy()[mask].sum()),
+        )
+
+    rate = METRIC_REGISTRY["case_increase_rate"]["compute"](
+        np.array([sums["last7"][0]]), np.array([sums["prev7"][0]])
+    )
+    last7_adjusted, last7 = sums["last7"]
+    return {
+        "last7_cases_adjusted": last7_adjusted,
+        "prev7_cases_adjusted": sums["prev7"][0],
+        "case_increase_rate_adjusted": float(rate[0]),
+        "last7_completeness": last7 / last7_adjusted if last7_adjusted else 1.0,
+    }
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+import pandas as pd
+
+from src.configuracao import (
+    METRICS_CACHE_ENABLED,
+    METRICS_CACHE_MAX_ENTRIES,
+    PROCESSED_DIR,
+    ensure_dir,
+)
+from src.governance import audit
+from src.relatorio.metricas import compute_metrics_from_cube, reference_date
+from src.relatorio.registro import METRIC_REGISTRY, REGISTRY_VERSION
+
+
+def _cache_dir() -> Path:
+    return PROCESSED_DIR / "metricas"
+
+
+def cube_fingerprint(cube: pd.DataFrame) -> str:
+    """SHA-256 do conteúdo do cubo diário (dias e contagens)."""
+    h = hashlib.sha256()
+    h.update(",".join(cube.columns).encode("utf-8"))
+    h.update(cube.index.to_numpy(dtype="datetime64[ns]").tobytes())
+    h.update(cube.to_numpy(dtype="int64").tobytes())
+    return h.hexdigest()
+
+
+def metrics_cache_key(cube: pd.DataFrame, as_of: pd.Timestamp) -> str:
+    payload = json.dumps(
+        {
+            "cube": cube_fingerprint(cube),
+            "registry_version": REGISTRY_VERSION,
+            "metrics": sorted(METRIC_REGISTRY),
+            "as_of": str(as_of.date()),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _evict(directory: Path, keep: int) -> int:
+    """Remove as entradas menos usadas recentemente além de `keep`."""
+    entries = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    stale = entries[: max(0, len(entries) - keep)]
+    for path in stale:
+        path.unlink(missing_ok=True)
+    return len(stale)
+
+
+def cached_metrics_from_cube(
+    cube: pd.DataFrame, as_of=None, use_cache: Optional[bool] = None
+) -> dict:
+    """`compute_metrics_from_cube` com memo persistente em PROCESSED_DIR/metricas.
+
+    A chave combina o conteúdo do cubo, a versão e os nomes das métricas
+    registradas e a data de referência; regenerar o relatório, refazer a
+    narrativa ou mudar só os gráficos reaproveita as métricas. Acertos
+    renovam a entrada, e as menos usadas recentemente saem quando o total
+    passa de METRICS_CACHE_MAX_ENTRIES.
+    """
+    if use_cache is None:
+        use_cache = METRICS_CACHE_ENABLED
+    now = reference_date(as_of)
+
+    if not use_cache:
+        audit("metrics_cache", {"status": "bypass", "as_of": str(now.date())})
+        return compute_metrics_from_cube(cube, as_of=now)
+
+    key = metrics_cache_key(cube, now)
+    path = _cache_dir() / f"{key[:32]}.json"
+
+    if path.exists():
+        try:
+            metrics = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+            audit("metrics_cache", {"status": "hit", "key": key[:16]})
+            return metrics
+        except (OSError, ValueError):
+            path.unlink(missing_ok=True)
+
+    metrics = compute_metrics_from_cube(cube, as_of=now)
+
+    evicted = 0
+    try:
+        ensure_dir(path.parent)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(metrics), encoding="utf-8")
+        tmp.replace(path)
+        evicted = _evict(path.parent, METRICS_CACHE_MAX_ENTRIES)
+        status = "miss"
+    except OSError:
+        status = "miss_write_failed"
+
+    audit("metrics_cache", {"status": status, "key": key[:16], "evicted": evicted})
+    return metrics
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
+import json
+
 from pathlib import Path
 
-from typing import Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from datetime import datetime
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+from src.configuracao import REPORTS_DIR, STRATA_MIN_CELL, TEMPLATES_DIR, ensure_dir
+
+from src.relatorio.estratos import STRATA_COLUMNS
 
-from src.configuracao import REPORTS_DIR, TEMPLATES_DIR
+if TYPE_CHECKING:
+    from jinja2 import Environment
 
 
 def _jinja_env() -> Environment:
+    # jinja2 só é importado ao renderizar o relatório.
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
     env = Environment(
         loader=FileSystemLoader(str(TEMPLATES_DIR)),
         autoescape=select_autoescape(enabled_extensions=(".html", ".xml")),
@@ -23,10 +31,57 @@ def _jinja_env() -> Environment:
     return env
 
 
+def _format_pct(value) -> str:
+    return "—" if value is None else f"{value:.2%}"
+
+
+def _format_strata_rows(strata: List[Dict]) -> List[Dict[str, str]]:
+    """Formata os registros de `stratified_records` para a tabela do relatório.
+
+    Células suprimidas aparecem como "—" e estratos sem valor como "ignorado".
+    """
+
+    rows = []
+
+    for r in strata:
+        label = " / ".join(
+            "ignorado" if r[c] is None else str(r[c]) for c in r if c in STRATA_COLUMNS
+        )
+
+        rows.append(
+            {
+                "label": label,
+                "last7_cases": "—"
+                if r["last7_cases"] is None
+                else str(r["last7_cases"]),
+                "prev7_cases": "—"
+                if r["prev7_cases"] is None
+                else str(r["prev7_cases"]),
+                "case_increase_rate": _format_pct(r["case_increase_rate"]),
+                "mortality_rate_30d": _format_pct(r["mortality_rate_30d"]),
+                "icu_rate_30d": _format_pct(r["icu_rate_30d"]),
+                "vaccination_rate": _format_pct(r["vaccination_rate"]),
+            }
+        )
+
+    return rows
+
+
 def write_markdown_report(
-    metrics: Dict, narrative: str, chart_paths: List[Path]
+    metrics: Dict,
+    narrative: str,
+    chart_paths: List[Path],
+    strata: Optional[List[Dict]] = None,
+    weekly: Optional[Dict] = None,
 ) -> Path:
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    """Grava o relatório em Markdown.
+
+    `strata` (opcional) são os registros de `stratified_records`, exibidos como
+    tabela de indicadores por estrato; `weekly` (opcional) é o resumo da
+    última semana epidemiológica (`weekly_summary`).
+    """
+
+    ensure_dir(REPORTS_DIR)
 
     context = {
         "generated_at": datetime.utcnow().strftime("%d/%m/%Y %H:%M UTC"),
@@ -35,6 +90,9 @@ def write_markdown_report(
         "charts": [str(p.name) for p in chart_paths],
         "data_source": "OpenDataSUS – SRAG 2021 a 2025",
         "data_url": "https://opendatasus.saude.gov.br/dataset/srag-2021-a-2024",
+        "strata": _format_strata_rows(strata or []),
+        "strata_min_cell": STRATA_MIN_CELL,
+        "weekly": weekly or {},
     }
 
     template_name = "modelo_relatorio.md.j2"
@@ -58,6 +116,22 @@ def write_markdown_report(
     return out_path
 
 
+def write_quality_profile(profile: Dict[str, Any], report_path: Path) -> Path:
+    """Grava o perfil de qualidade da limpeza como JSON compacto ao lado do relatório.
+
+    O arquivo tem o nome do relatório com o sufixo `.qualidade.json`.
+    """
+
+    out_path = report_path.with_name(report_path.stem + ".qualidade.json")
+
+    out_path.write_text(
+        json.dumps(profile, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+
+    return out_path
+
+
 def _fallback_markdown(
     generated_at: str,
     metrics: Dict,
@@ -65,6 +139,9 @@ def _fallback_markdown(
     charts: List[str],
     data_source: str,
     data_url: str,
+    strata: Optional[List[Dict[str, str]]] = None,
+    strata_min_cell: int = 0,
+    weekly: Optional[Dict] = None,
 ) -> str:
     lines = []
 
@@ -80,6 +157,18 @@ def _fallback_markdown(
 
     lines.append(f"- Variação de casos: {metrics.get('case_increase_rate', 0.0):.2%}")
 
+    if "last7_cases_adjusted" in metrics:
+        lines.append(
+            "- Casos (últimos 7 dias, ajustado pelo atraso de notificação): "
+            f"{metrics['last7_cases_adjusted']:.0f} "
+            f"(completude estimada: {metrics['last7_completeness']:.2%})"
+        )
+
+        lines.append(
+            "- Variação de casos (ajustada): "
+            f"{metrics['case_increase_rate_adjusted']:.2%}"
+        )
+
     lines.append(
         f"- Mortalidade (30 dias): {metrics.get('mortality_rate_30d', 0.0):.2%}"
     )
@@ -90,6 +179,42 @@ def _fallback_markdown(
         f"- Vacinação (proxy nos casos): {metrics.get('vaccination_rate', 0.0):.2%}\n"
     )
 
+    if weekly:
+        lines.append("## Semana epidemiológica\n")
+
+        lines.append(
+            f"- {weekly['label']}: {weekly['cases']} casos "
+            f"({weekly['prev_cases']} na SE anterior)"
+        )
+
+        lines.append(f"- Variação semanal: {weekly['case_increase_rate']:.2%}")
+
+        lines.append(f"- Mortalidade na SE: {weekly['mortality_rate']:.2%}")
+
+        lines.append(f"- UTI na SE: {weekly['icu_rate']:.2%}\n")
+
+    if strata:
+        lines.append("## Indicadores por estrato\n")
+
+        lines.append(
+            "| Estrato | Casos 7d | Casos 7d anteriores | Variação "
+            "| Mortalidade 30d | UTI 30d | Vacinação |"
+        )
+
+        lines.append("|---|---|---|---|---|---|---|")
+
+        for r in strata:
+            lines.append(
+                f"| {r['label']} | {r['last7_cases']} | {r['prev7_cases']} "
+                f"| {r['case_increase_rate']} | {r['mortality_rate_30d']} "
+                f"| {r['icu_rate_30d']} | {r['vaccination_rate']} |"
+            )
+
+        lines.append(
+            f"\nCélulas com menos de {strata_min_cell} casos são suprimidas (—), "
+            "com uma célula complementar quando a métrica teria só uma omitida.\n"
+        )
+
     lines.append("## Resumo\n")
 
     lines.append(narrative + "\n")
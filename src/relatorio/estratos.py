@@ -0,0 +1,177 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+from src.configuracao import SENSITIVE_FIELDS, STRATA_MIN_CELL
+from src.governance import audit, guardrail_check
+from src.relatorio.agregados import CUBE_COLUMNS, cube_weights
+from src.relatorio.metricas import WINDOWS, build_metrics_frame, reference_date
+from src.relatorio.registro import METRIC_REGISTRY, window_inputs
+
+
+# Colunas aceitas como estrato: UF e município de notificação e faixa etária.
+STRATA_COLUMNS = ["sg_uf_not", "co_mun_not", "age_band"]
+
+
+def _window_buckets():
+    """Divide os dias antes de `as_of` em faixas que nenhuma janela corta.
+
+    A faixa b cobre os dias com (edges[b-1], edges[b]] dias de distância; cada
+    janela de WINDOWS é a soma de um conjunto contíguo de faixas.
+    """
+    edges = np.array(sorted({d for w in WINDOWS.values() for d in w}))
+    members = {
+        window: [
+            b for b in range(1, len(edges)) if edges[b - 1] >= end and edges[b] <= start
+        ]
+        for window, (start, end) in WINDOWS.items()
+    }
+    return edges, members
+
+
+def compute_stratified_metrics(
+    df: pd.DataFrame,
+    by: Union[str, Sequence[str]],
+    as_of=None,
+    min_cell: Optional[int] = None,
+) -> pd.DataFrame:
+    """Métricas centrais por estrato (UF, município, faixa etária) numa só agregação.
+
+    Cada caso recebe a faixa de dias (relativa a `as_of`) em que cai; um único
+    groupby por estrato + faixa soma as colunas do cubo, e cada janela é a soma
+    das suas faixas. Retorna uma tabela com uma linha por estrato: as colunas
+    de `by`, as métricas registradas, `as_of` e `suppressed`.
+
+    Privacidade: campos de SENSITIVE_FIELDS não podem ser usados como estrato
+    (use `age_band` no lugar da idade), e métricas calculadas sobre alguma
+    contagem entre 1 e `min_cell` - 1 (padrão: STRATA_MIN_CELL) são
+    suprimidas, com supressão complementar (ver `_suppress_small_cells`).
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    if min_cell is None:
+        min_cell = STRATA_MIN_CELL
+
+    for col in by:
+        if col in SENSITIVE_FIELDS:
+            raise ValueError(
+                f"Estrato '{col}' é um campo sensível; use uma versão em faixas "
+                "(por exemplo, age_band para a idade)"
+            )
+        if col not in STRATA_COLUMNS:
+            raise ValueError(f"Estrato desconhecido: {col} (use {STRATA_COLUMNS})")
+    if "case_date" not in df.columns:
+        raise ValueError("DataFrame sem coluna 'case_date' após limpeza")
+
+    now = reference_date(as_of)
+    edges, members = _window_buckets()
+
+    dates = df["case_date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    days_back = (np.datetime64(now.date(), "D") - dates).astype(np.int64)
+    bucket = np.searchsorted(edges, days_back, side="left")
+    in_range = (bucket >= 1) & (bucket < len(edges)) & ~np.isnat(dates)
+
+    keys = {
+        col: (
+            df[col]
+            if col in df.columns
+            else pd.Series(np.nan, index=df.index, dtype="object")
+        )
+        for col in by
+    }
+    frame = pd.DataFrame(
+        {**{col: s.to_numpy() for col, s in keys.items()}, **cube_weights(df)}
+    )
+    for col, s in keys.items():
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            frame[col] = pd.Categorical(frame[col], dtype=s.dtype)
+    frame["bucket"] = bucket
+    frame = frame[in_range]
+
+    grouped = frame.groupby(by + ["bucket"], observed=True, dropna=False)[
+        CUBE_COLUMNS
+    ].sum()
+    wide = grouped.unstack("bucket", fill_value=0)
+
+    zeros = np.zeros(len(wide), dtype=np.int64)
+    sums = {
+        window: {
+            c: sum(
+                (
+                    wide[(c, b)].to_numpy(dtype=np.int64)
+                    for b in buckets
+                    if (c, b) in wide
+                ),
+                zeros,
+            )
+            for c in CUBE_COLUMNS
+        }
+        for window, buckets in members.items()
+    }
+    table = build_metrics_frame(sums, wide.index)
+
+    table = _suppress_small_cells(table, sums, min_cell)
+    table["as_of"] = str(now.date())
+
+    audit(
+        "stratified_metrics",
+        {
+            "by": by,
+            "strata": int(len(table)),
+            "suppressed": int(table["suppressed"].sum()),
+            "min_cell": min_cell,
+        },
+    )
+    return table.reset_index()
+
+
+def _suppress_small_cells(
+    table: pd.DataFrame, sums: Dict, min_cell: int
+) -> pd.DataFrame:
+    """Suprime cada métrica cuja conta usa alguma soma de janela entre 1 e min_cell - 1.
+
+    As somas de que cada métrica depende vêm do grafo do registro, então
+    métricas novas são protegidas sem configuração extra. Os estratos somam o
+    total nacional do relatório: se uma métrica tem uma única célula suprimida,
+    a de menor soma positiva entre as demais também é suprimida, para que a
+    célula não saia por subtração.
+    """
+    counts = [c for c in table.columns if METRIC_REGISTRY[c]["kind"] == "count"]
+    table = table.astype({c: "Int64" for c in counts})
+    suppressed = np.zeros(len(table), dtype=bool)
+
+    if min_cell > 1:
+        for metric in table.columns:
+            hide = np.zeros(len(table), dtype=bool)
+            smallest = np.full(len(table), np.inf)
+            for leaf in window_inputs(metric):
+                window, column = leaf.split(".")
+                values = sums[window][column]
+                hide |= (values > 0) & (values < min_cell)
+                smallest = np.minimum(smallest, np.where(values > 0, values, np.inf))
+            if hide.sum() == 1 and len(table) > 1:
+                # Supressão complementar; sem soma positiva, qualquer outro estrato.
+                others = np.flatnonzero(~hide)
+                hide[others[np.argmin(smallest[others])]] = True
+            table.loc[hide, metric] = pd.NA if metric in counts else np.nan
+            suppressed |= hide
+
+    table["suppressed"] = suppressed
+    return table
+
+
+def stratified_records(table: pd.DataFrame) -> List[Dict]:
+    """Linhas da tabela estratificada como dicts; células suprimidas viram None."""
+    clean = table.astype(object).where(table.notna(), None)
+    return clean.to_dict("records")
+
+
+def check_stratified_guardrails(records: List[Dict]) -> List[str]:
+    """Roda `guardrail_check` em cada estrato e audita as violações."""
+    violations = []
+    for record in records:
+        label = ", ".join(f"{c}={record[c]}" for c in record if c in STRATA_COLUMNS)
+        violations.extend(f"[{label}] {v}" for v in guardrail_check(record))
+    if violations:
+        audit("guardrail_violations", {"scope": "strata", "violations": violations})
+    return violations
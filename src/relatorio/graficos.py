@@ -1,51 +1,267 @@
 from __future__ import annotations
+import hashlib
+import importlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
+from typing import List, Optional, Tuple
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
 
-from src.configuracao import REPORTS_DIR
+from src.configuracao import (
+    ASSETS_DIR,
+    CHART_BACKEND,
+    CHART_CACHE_ENABLED,
+    CHART_CACHE_MAX_BYTES,
+    CHART_WORKERS,
+    REPORTS_DIR,
+    ensure_dir,
+)
+from src.governance import audit
+from src.relatorio.agregados import build_daily_cube
+
+
+# Um gráfico a renderizar: (backend, tipo, dados já agregados, título, destino).
+ChartJob = Tuple[str, str, pd.DataFrame, str, Path]
+
+# Backends de renderização: módulo com RENDERERS (tipo -> função) e extensão.
+# O módulo só é importado ao renderizar, então o backend svg nunca carrega
+# matplotlib nem seaborn.
+CHART_BACKENDS = {
+    "png": "src.relatorio.graficos_png",
+    "svg": "src.relatorio.graficos_svg",
+}
+
+
+# Parâmetros de estilo; entram na chave do cache de gráficos.
+CHART_STYLE = {
+    "figsize": (10, 4),
+    "dpi": 150,
+    "xtick_rotation": 45,
+    "colors": {"monthly": "#4C78A8", "weekly": "#F58518"},
+}
 
 
 def _ensure_reports_dir() -> Path:
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    return REPORTS_DIR
+    return ensure_dir(REPORTS_DIR)
+
+
+def _render_job(job: ChartJob) -> Path:
+    backend, kind, data, title, path = job
+    importlib.import_module(CHART_BACKENDS[backend]).RENDERERS[kind](data, title, path)
+    return path
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    backend = backend or CHART_BACKEND
+    if backend not in CHART_BACKENDS:
+        raise ValueError(
+            f"Backend de gráficos desconhecido: {backend} (use {list(CHART_BACKENDS)})"
+        )
+    return backend
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def chart_job_key(job: ChartJob) -> str:
+    """SHA-256 dos dados plotados, do backend, do tipo, do título e do estilo."""
+    backend, kind, data, title, _ = job
+    h = hashlib.sha256()
+    h.update(
+        json.dumps(
+            {
+                "backend": backend,
+                "kind": kind,
+                "title": title,
+                "style": CHART_STYLE,
+                "columns": [[str(c), str(t)] for c, t in data.dtypes.items()],
+                "matplotlib": _package_version("matplotlib"),
+                "seaborn": _package_version("seaborn"),
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+    )
+    h.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _chart_cache_dir() -> Path:
+    return ASSETS_DIR / "graficos"
+
+
+def _evict_charts(directory: Path, max_bytes: int) -> int:
+    """Remove os gráficos menos usados recentemente até caber em `max_bytes`."""
+    entries = sorted(
+        (p for p in directory.iterdir() if p.suffix in (".png", ".svg")),
+        key=lambda p: p.stat().st_mtime,
+    )
+    total = sum(p.stat().st_size for p in entries)
+    evicted = 0
+    for path in entries:
+        if total <= max_bytes:
+            break
+        total -= path.stat().st_size
+        path.unlink(missing_ok=True)
+        evicted += 1
+    return evicted
+
+
+def _render_jobs(jobs: List[ChartJob], max_workers: Optional[int]) -> None:
+    workers = max_workers if max_workers is not None else CHART_WORKERS
+    workers = min(len(jobs), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for job in jobs:
+            _render_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_render_job, jobs))
+
 
+def render_chart_jobs(
+    jobs: List[ChartJob],
+    max_workers: Optional[int] = None,
+    use_cache: Optional[bool] = None,
+) -> List[Path]:
+    """Renderiza os gráficos, cada um em uma figura independente.
 
-def generate_charts(df: pd.DataFrame) -> tuple[Path, Path]:
+    Com mais de um gráfico e de um worker (padrão: CHART_WORKERS; 0 usa um
+    processo por gráfico, até o número de CPUs), cada job vai para um
+    processo do pool e o conjunto leva o tempo do gráfico mais lento.
+
+    Com o cache (padrão: CHART_CACHE_ENABLED), cada imagem fica em
+    ASSETS_DIR/graficos com o nome de `chart_job_key`; se os dados e o estilo
+    não mudaram, a imagem guardada é copiada para o destino sem renderizar.
+    O total é limitado a CHART_CACHE_MAX_BYTES (saem as menos usadas).
+    Retorna os caminhos na ordem dos jobs.
+    """
+    if use_cache is None:
+        use_cache = CHART_CACHE_ENABLED
+    if not use_cache:
+        _render_jobs(jobs, max_workers)
+        audit("chart_cache", {"status": "bypass", "charts": len(jobs)})
+        return [job[4] for job in jobs]
+
+    cache_dir = ensure_dir(_chart_cache_dir())
+    assets = [cache_dir / f"{chart_job_key(j)[:32]}{j[4].suffix}" for j in jobs]
+
+    # Cada imagem nova é renderizada num temporário e só então publicada.
+    misses = {}
+    for (backend, kind, data, title, _), asset in zip(jobs, assets):
+        if not asset.exists() and asset not in misses:
+            tmp = asset.with_name(asset.name + ".tmp")
+            misses[asset] = (backend, kind, data, title, tmp)
+    _render_jobs(list(misses.values()), max_workers)
+    for asset, job in misses.items():
+        job[4].replace(asset)
+
+    for job, asset in zip(jobs, assets):
+        shutil.copyfile(asset, job[4])
+        os.utime(asset)
+
+    evicted = _evict_charts(cache_dir, CHART_CACHE_MAX_BYTES)
+    audit(
+        "chart_cache",
+        {
+            "hits": len(jobs) - len(misses),
+            "misses": len(misses),
+            "evicted": evicted,
+        },
+    )
+    return [job[4] for job in jobs]
+
+
+def daily_chart_jobs(
+    daily_counts: pd.Series, backend: Optional[str] = None
+) -> List[ChartJob]:
+    """Jobs dos gráficos diário (30 dias) e mensal (12 meses) do cubo diário.
+
+    `backend` (padrão: CHART_BACKEND) é "png" ou "svg".
+    """
+    backend = _resolve_backend(backend)
     out_dir = _ensure_reports_dir()
 
     now = pd.Timestamp(datetime.utcnow().date())
+    daily_counts = daily_counts[daily_counts > 0]
     start_30 = now - timedelta(days=30)
-    df_30 = df[(df["case_date"] >= start_30) & (df["case_date"] < now)].copy()
-    daily = df_30.groupby(df_30["case_date"].dt.date).size().reset_index(name="cases")
-
-    plt.figure(figsize=(10, 4))
-    sns.lineplot(data=daily, x="case_date", y="cases", marker="o")
-    plt.title("Casos diários de SRAG (últimos 30 dias)")
-    plt.xlabel("Data")
-    plt.ylabel("Casos")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    daily_path = out_dir / "casos_diarios_ultimos_30d.png"
-    plt.savefig(daily_path, dpi=150)
-    plt.close()
+    last_30 = daily_counts[
+        (daily_counts.index >= start_30) & (daily_counts.index < now)
+    ]
+    daily = pd.DataFrame({"case_date": last_30.index.date, "cases": last_30.to_numpy()})
 
     start_12m = now - timedelta(days=365)
-    df_12m = df[(df["case_date"] >= start_12m) & (df["case_date"] < now)].copy()
-    df_12m["month"] = df_12m["case_date"].dt.to_period("M").dt.to_timestamp()
-    monthly = df_12m.groupby("month").size().reset_index(name="cases")
-
-    plt.figure(figsize=(10, 4))
-    sns.barplot(data=monthly, x="month", y="cases", color="#4C78A8")
-    plt.title("Casos mensais de SRAG (últimos 12 meses)")
-    plt.xlabel("Mês")
-    plt.ylabel("Casos")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    monthly_path = out_dir / "casos_mensais_ultimos_12m.png"
-    plt.savefig(monthly_path, dpi=150)
-    plt.close()
+    last_12m = daily_counts[
+        (daily_counts.index >= start_12m) & (daily_counts.index < now)
+    ]
+    month = last_12m.index.to_period("M").to_timestamp()
+    monthly = (
+        last_12m.groupby(month).sum().rename_axis("month").reset_index(name="cases")
+    )
+
+    return [
+        (
+            backend,
+            "daily",
+            daily,
+            "Casos diários de SRAG (últimos 30 dias)",
+            out_dir / f"casos_diarios_ultimos_30d.{backend}",
+        ),
+        (
+            backend,
+            "monthly",
+            monthly,
+            "Casos mensais de SRAG (últimos 12 meses)",
+            out_dir / f"casos_mensais_ultimos_12m.{backend}",
+        ),
+    ]
+
 
+def weekly_chart_job(
+    weekly: pd.DataFrame, weeks: int = 26, backend: Optional[str] = None
+) -> ChartJob:
+    """Job do gráfico de casos por SE (`compute_weekly_metrics`), últimas `weeks`."""
+    backend = _resolve_backend(backend)
+    out_dir = _ensure_reports_dir()
+
+    recent = weekly.tail(weeks)
+    labels = [
+        f"{int(w):02d}/{int(y) % 100:02d}"
+        for y, w in zip(recent["epi_year"], recent["epi_week"])
+    ]
+    data = pd.DataFrame({"se": labels, "cases": recent["cases"].to_numpy()})
+
+    title = f"Casos de SRAG por semana epidemiológica (últimas {weeks} SE)"
+    return (backend, "weekly", data, title, out_dir / f"casos_semanais_se.{backend}")
+
+
+def generate_charts(
+    df: pd.DataFrame, backend: Optional[str] = None
+) -> tuple[Path, Path]:
+    return generate_charts_from_daily(build_daily_cube(df)["cases"], backend)
+
+
+def generate_charts_from_daily(
+    daily_counts: pd.Series, backend: Optional[str] = None
+) -> tuple[Path, Path]:
+    """Gera os gráficos a partir da contagem de casos por dia (índice: data).
+
+    Recebe a coluna `cases` do cubo diário (`build_daily_cube`); `backend`
+    (padrão: CHART_BACKEND) escolhe entre PNG e SVG.
+    """
+    jobs = daily_chart_jobs(daily_counts, backend)
+    daily_path, monthly_path = render_chart_jobs(jobs)
     return daily_path, monthly_path
+
+
+def generate_weekly_chart(
+    weekly: pd.DataFrame, weeks: int = 26, backend: Optional[str] = None
+) -> Path:
+    """Barras dos casos por SE (`compute_weekly_metrics`), últimas `weeks`."""
+    return render_chart_jobs([weekly_chart_job(weekly, weeks, backend)])[0]
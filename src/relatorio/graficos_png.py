@@ -0,0 +1,57 @@
+from __future__ import annotations
+from pathlib import Path
+import pandas as pd
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.relatorio.graficos import CHART_STYLE
+
+
+def _new_figure() -> Figure:
+    # Figura isolada com canvas Agg próprio, sem o estado global do pyplot.
+    fig = Figure(figsize=CHART_STYLE["figsize"])
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _finish(fig: Figure, ax, title: str, xlabel: str, path: Path) -> None:
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Casos")
+    for label in ax.get_xticklabels():
+        label.set_rotation(CHART_STYLE["xtick_rotation"])
+    fig.tight_layout()
+    fig.savefig(path, dpi=CHART_STYLE["dpi"], format="png")
+
+
+def _render_daily(data: pd.DataFrame, title: str, path: Path) -> None:
+    fig = _new_figure()
+    ax = fig.add_subplot()
+    sns.lineplot(data=data, x="case_date", y="cases", marker="o", ax=ax)
+    _finish(fig, ax, title, "Data", path)
+
+
+def _render_monthly(data: pd.DataFrame, title: str, path: Path) -> None:
+    fig = _new_figure()
+    ax = fig.add_subplot()
+    sns.barplot(
+        data=data, x="month", y="cases", color=CHART_STYLE["colors"]["monthly"], ax=ax
+    )
+    _finish(fig, ax, title, "Mês", path)
+
+
+def _render_weekly(data: pd.DataFrame, title: str, path: Path) -> None:
+    fig = _new_figure()
+    ax = fig.add_subplot()
+    sns.barplot(
+        data=data, x="se", y="cases", color=CHART_STYLE["colors"]["weekly"], ax=ax
+    )
+    _finish(fig, ax, title, "SE/ano", path)
+
+
+RENDERERS = {
+    "daily": _render_daily,
+    "monthly": _render_monthly,
+    "weekly": _render_weekly,
+}
@@ -0,0 +1,148 @@
+from __future__ import annotations
+import math
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple
+from xml.sax.saxutils import escape
+import pandas as pd
+
+from src.relatorio.graficos import CHART_STYLE
+
+
+# Gráficos em SVG escrito à mão: só biblioteca padrão (sem matplotlib/seaborn).
+
+_PX_PER_INCH = 100
+_LINE_COLOR = "#1F77B4"
+_FONT = 'font-family="DejaVu Sans, Arial, sans-serif"'
+
+# Margens da área de plotagem: esquerda, topo, direita, base.
+_MARGINS = (70, 40, 20, 90)
+
+
+def _nice_ticks(top: float, count: int = 5) -> List[float]:
+    """Marcas do eixo y de 0 até cobrir `top`, com passo 1, 2 ou 5 x 10^k."""
+    if top <= 0:
+        return [0.0, 1.0]
+    raw = top / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    return [i * step for i in range(int(math.ceil(top / step)) + 1)]
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+def _axes(
+    title: str, xlabel: str, labels: Sequence[str], positions: Sequence[float], top
+) -> Tuple[List[str], Callable[[float], float]]:
+    """Moldura comum: título, eixos, marcas e rótulos. Retorna (elementos, y(v))."""
+    width = CHART_STYLE["figsize"][0] * _PX_PER_INCH
+    height = CHART_STYLE["figsize"][1] * _PX_PER_INCH
+    left, upper, right, bottom = _MARGINS
+    plot_h = height - upper - bottom
+    ticks = _nice_ticks(top)
+
+    def y(v: float) -> float:
+        return upper + plot_h * (1 - v / ticks[-1])
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" viewBox="0 0 {width} {height}">',
+        f'<rect width="{width}" height="{height}" fill="#FFFFFF"/>',
+        f'<text x="{width / 2:.1f}" y="24" text-anchor="middle" font-size="15" '
+        f"{_FONT}>{escape(title)}</text>",
+    ]
+    for t in ticks:
+        parts.append(
+            f'<line x1="{left}" x2="{width - right}" y1="{y(t):.1f}" '
+            f'y2="{y(t):.1f}" stroke="#E5E5E5"/>'
+        )
+        parts.append(
+            f'<text x="{left - 6}" y="{y(t) + 4:.1f}" text-anchor="end" '
+            f'font-size="11" {_FONT}>{_fmt(t)}</text>'
+        )
+    rotation = -CHART_STYLE["xtick_rotation"]
+    for label, x in zip(labels, positions):
+        base = height - bottom + 14
+        parts.append(
+            f'<text x="{x:.1f}" y="{base}" text-anchor="end" font-size="10" '
+            f'transform="rotate({rotation} {x:.1f} {base})" {_FONT}>'
+            f"{escape(label)}</text>"
+        )
+    parts += [
+        f'<line x1="{left}" x2="{width - right}" y1="{height - bottom}" '
+        f'y2="{height - bottom}" stroke="#333333"/>',
+        f'<line x1="{left}" x2="{left}" y1="{upper}" y2="{height - bottom}" '
+        'stroke="#333333"/>',
+        f'<text x="{(left + width - right) / 2:.1f}" y="{height - 8}" '
+        f'text-anchor="middle" font-size="12" {_FONT}>{escape(xlabel)}</text>',
+        f'<text x="16" y="{upper + plot_h / 2:.1f}" text-anchor="middle" '
+        f'font-size="12" transform="rotate(-90 16 {upper + plot_h / 2:.1f})" '
+        f"{_FONT}>Casos</text>",
+    ]
+    return parts, y
+
+
+def _slots(n: int) -> Tuple[List[float], float]:
+    # Centro de cada categoria no eixo x e a largura de cada faixa.
+    width = CHART_STYLE["figsize"][0] * _PX_PER_INCH
+    left, _, right, _ = _MARGINS
+    slot = (width - left - right) / max(n, 1)
+    return [left + slot * (i + 0.5) for i in range(n)], slot
+
+
+def _write(parts: List[str], path: Path) -> None:
+    Path(path).write_text("\n".join(parts + ["</svg>"]) + "\n", encoding="utf-8")
+
+
+def _line_chart(labels, values, title: str, xlabel: str, path: Path) -> None:
+    xs, _ = _slots(len(values))
+    parts, y = _axes(title, xlabel, labels, xs, max(values, default=0))
+    if values:
+        points = " ".join(f"{x:.1f},{y(v):.1f}" for x, v in zip(xs, values))
+        parts.append(
+            f'<polyline points="{points}" fill="none" stroke="{_LINE_COLOR}" '
+            'stroke-width="2"/>'
+        )
+        parts += [
+            f'<circle cx="{x:.1f}" cy="{y(v):.1f}" r="3.5" fill="{_LINE_COLOR}"/>'
+            for x, v in zip(xs, values)
+        ]
+    _write(parts, path)
+
+
+def _bar_chart(labels, values, color, title: str, xlabel: str, path: Path) -> None:
+    xs, slot = _slots(len(values))
+    parts, y = _axes(title, xlabel, labels, xs, max(values, default=0))
+    bar = slot * 0.8
+    parts += [
+        f'<rect x="{x - bar / 2:.1f}" y="{y(v):.1f}" width="{bar:.1f}" '
+        f'height="{y(0) - y(v):.1f}" fill="{color}"/>'
+        for x, v in zip(xs, values)
+    ]
+    _write(parts, path)
+
+
+def _render_daily(data: pd.DataFrame, title: str, path: Path) -> None:
+    labels = [pd.Timestamp(d).strftime("%d/%m") for d in data["case_date"]]
+    _line_chart(labels, data["cases"].tolist(), title, "Data", path)
+
+
+def _render_monthly(data: pd.DataFrame, title: str, path: Path) -> None:
+    labels = [pd.Timestamp(m).strftime("%m/%Y") for m in data["month"]]
+    color = CHART_STYLE["colors"]["monthly"]
+    _bar_chart(labels, data["cases"].tolist(), color, title, "Mês", path)
+
+
+def _render_weekly(data: pd.DataFrame, title: str, path: Path) -> None:
+    color = CHART_STYLE["colors"]["weekly"]
+    _bar_chart(
+        data["se"].tolist(), data["cases"].tolist(), color, title, "SE/ano", path
+    )
+
+
+RENDERERS = {
+    "daily": _render_daily,
+    "monthly": _render_monthly,
+    "weekly": _render_weekly,
+}
@@ -1,58 +1,199 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 
+from src.relatorio.agregados import CUBE_COLUMNS, build_daily_cube
+from src.relatorio.semana_epi import (
+    build_epi_calendar,
+    epi_week_label,
+    epi_week_start,
+    lookup_epi_weeks,
+)
+from src.relatorio.registro import (
+    METRIC_REGISTRY,
+    WINDOWS,
+    WindowSum,
+    evaluate_metrics,
+)
 
-def _safe_div(n: float, d: float) -> float:
-    return float(n) / float(d) if float(d) != 0 else 0.0
 
+def build_cube_index(cube: pd.DataFrame) -> dict:
+    """Somas prefixadas das colunas do cubo diário, para janelas por busca binária.
+
+    Retorna os dias (datetime64[ns], ordenados) e, para cada coluna de
+    CUBE_COLUMNS, a soma acumulada com um zero inicial; qualquer janela
+    [início, fim) vira duas buscas binárias e uma subtração.
+    """
+    if not cube.index.is_monotonic_increasing:
+        cube = cube.sort_index()
+    prefix = {
+        name: np.concatenate([[0], np.cumsum(cube[name].to_numpy(dtype=np.int64))])
+        for name in CUBE_COLUMNS
+    }
+    return {"dates": cube.index.to_numpy(dtype="datetime64[ns]"), "prefix": prefix}
+
+
+def reference_date(as_of=None) -> pd.Timestamp:
+    if as_of is None:
+        return pd.Timestamp(datetime.utcnow().date())
+    return pd.Timestamp(as_of).normalize()
+
+
+def _cube_window_sum(index: dict, as_of: np.ndarray) -> WindowSum:
+    """Somas de janela sobre o cubo para cada data de `as_of` (datetime64[ns]).
+
+    As posições de cada janela (duas buscas binárias) são calculadas uma vez e
+    reaproveitadas por todas as colunas pedidas.
+    """
+    bounds = {}
+
+    def window_sum(window: str, column: str) -> np.ndarray:
+        if window not in bounds:
+            start_days, end_days = WINDOWS[window]
+            bounds[window] = (
+                np.searchsorted(
+                    index["dates"], as_of - np.timedelta64(start_days, "D")
+                ),
+                np.searchsorted(index["dates"], as_of - np.timedelta64(end_days, "D")),
+            )
+        i, j = bounds[window]
+        prefix = index["prefix"][column]
+        return prefix[j] - prefix[i]
+
+    return window_sum
 
-def compute_core_metrics(df: pd.DataFrame) -> dict:
-    now = pd.Timestamp(datetime.utcnow().date())
 
-    if "case_date" not in df.columns:
-        raise ValueError("DataFrame sem coluna 'case_date' após limpeza")
+def _metrics_dict(values: dict, now: pd.Timestamp) -> dict:
+    metrics = {
+        name: int(v[0]) if METRIC_REGISTRY[name]["kind"] == "count" else float(v[0])
+        for name, v in values.items()
+    }
+    metrics["as_of"] = str(now.date())
+    return metrics
+
+
+def compute_core_metrics(df: pd.DataFrame, as_of=None) -> dict:
+    return compute_metrics_from_cube(build_daily_cube(df), as_of=as_of)
 
-    last7_start = now - timedelta(days=7)
-    prev7_start = now - timedelta(days=14)
 
-    mask_last7 = (df["case_date"] >= last7_start) & (df["case_date"] < now)
-    mask_prev7 = (df["case_date"] >= prev7_start) & (df["case_date"] < last7_start)
+def compute_metrics_from_cube(cube: pd.DataFrame, as_of=None) -> dict:
+    """Calcula as métricas registradas a partir do cubo diário (`build_daily_cube`).
 
-    last7_cases = int(mask_last7.sum())
-    prev7_cases = int(mask_prev7.sum())
+    `as_of` (padrão: hoje, UTC) é a data de referência; as janelas terminam no
+    dia anterior a ela. Retorna {métrica: valor} para as métricas de saída do
+    registro, na ordem de registro, mais a data de referência em `as_of`.
+    """
+    now = reference_date(as_of)
 
-    case_increase_rate = _safe_div(
-        last7_cases - prev7_cases, prev7_cases if prev7_cases else 1
+    window_sum = _cube_window_sum(
+        build_cube_index(cube), np.array([now], dtype="datetime64[ns]")
     )
 
-    last30_start = now - timedelta(days=30)
-    mask_30 = (df["case_date"] >= last30_start) & (df["case_date"] < now)
-    df_30 = df.loc[mask_30]
-    deaths_30 = int(df_30.get("death_flag", pd.Series(False, index=df_30.index)).sum())
-    cases_30 = int(len(df_30))
-    mortality_rate_30d = _safe_div(deaths_30, cases_30)
-
-    icu_30 = int(df_30.get("icu_flag", pd.Series(False, index=df_30.index)).sum())
-    icu_rate_30d = _safe_div(icu_30, cases_30)
-
-    last12m_start = now - timedelta(days=365)
-    df_12m = df[(df["case_date"] >= last12m_start) & (df["case_date"] < now)]
-    if "vaccinated_flag" in df_12m.columns:
-        known = df_12m[~df_12m["vaccinated_flag"].isna()]
-        vaccinated = int(known["vaccinated_flag"].fillna(False).sum())
-        denom = int(len(known)) if len(known) else int(len(df_12m))
-    else:
-        vaccinated = 0
-        denom = int(len(df_12m)) if len(df_12m) else 1
-    vaccination_rate = _safe_div(vaccinated, denom)
+    return _metrics_dict(evaluate_metrics(window_sum), now)
+
+
+def backfill_core_metrics(cube: pd.DataFrame, start, end) -> pd.DataFrame:
+    """Métricas registradas para cada data de referência de `start` a `end` (inclusive).
 
+    Equivale a chamar `compute_metrics_from_cube(cube, as_of=d)` para cada dia,
+    mas todas as janelas saem de buscas binárias vetorizadas sobre as somas
+    prefixadas do cubo. Retorna um DataFrame indexado por `as_of` com as
+    métricas numéricas.
+    """
+    dates = pd.date_range(reference_date(start), reference_date(end), freq="D")
+
+    window_sum = _cube_window_sum(
+        build_cube_index(cube), dates.to_numpy(dtype="datetime64[ns]")
+    )
+
+    return pd.DataFrame(
+        evaluate_metrics(window_sum), index=pd.DatetimeIndex(dates, name="as_of")
+    )
+
+
+# Taxas semanais: nome -> (métrica do registro, colunas da tabela semanal).
+WEEKLY_RATES = {
+    "case_increase_rate": ("case_increase_rate", ("cases", "prev_cases")),
+    "mortality_rate": ("mortality_rate_30d", ("deaths", "cases")),
+    "icu_rate": ("icu_rate_30d", ("icu", "cases")),
+}
+
+
+def compute_weekly_metrics(cube: pd.DataFrame, as_of=None) -> pd.DataFrame:
+    """Série por semana epidemiológica (SE) a partir do cubo diário.
+
+    Vai da SE do primeiro dia do cubo até a última SE completa antes de
+    `as_of` (padrão: hoje, UTC), incluindo semanas sem casos. Os dias são
+    agrupados numa única passada (bincount pelo número da semana) e os rótulos
+    vêm da tabela de `build_epi_calendar`. Colunas: `epi_year`, `epi_week`,
+    `week_start`, as colunas do cubo, `prev_cases` e as taxas da semana, com
+    as mesmas definições do registro (`case_increase_rate` compara com a SE
+    anterior).
+    """
+    now = reference_date(as_of)
+    end = epi_week_start(np.array([now], dtype="datetime64[D]"))[0]
+
+    days = cube.index.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    keep = days < end
+    if not keep.any():
+        return pd.DataFrame(
+            columns=["epi_year", "epi_week", "week_start", *CUBE_COLUMNS]
+            + ["prev_cases", *WEEKLY_RATES]
+        )
+
+    first = epi_week_start(days[keep].min(keepdims=True))[0]
+    n_weeks = int((end - first).astype(np.int64) // 7)
+    codes = (days[keep] - first).astype(np.int64) // 7
+
+    starts = first + 7 * np.arange(n_weeks).astype("timedelta64[D]")
+    calendar = build_epi_calendar(first, end - np.timedelta64(1, "D"))
+    year, week = lookup_epi_weeks(calendar, starts)
+
+    sums = {
+        c: np.bincount(
+            codes, weights=cube[c].to_numpy()[keep], minlength=n_weeks
+        ).astype(np.int64)
+        for c in CUBE_COLUMNS
+    }
+    prev = np.concatenate([[0], sums["cases"][:-1]])
+
+    table = pd.DataFrame(
+        {
+            "epi_year": year,
+            "epi_week": week,
+            "week_start": starts.astype("datetime64[ns]"),
+            **sums,
+            "prev_cases": prev,
+        }
+    )
+    for name, (metric, inputs) in WEEKLY_RATES.items():
+        table[name] = METRIC_REGISTRY[metric]["compute"](
+            *(table[c].to_numpy() for c in inputs)
+        )
+    return table
+
+
+def weekly_summary(weekly: pd.DataFrame) -> dict:
+    """Última SE completa comparada com a anterior, para o relatório."""
+    if weekly.empty:
+        return {}
+    last = weekly.iloc[-1]
     return {
-        "last7_cases": last7_cases,
-        "prev7_cases": prev7_cases,
-        "case_increase_rate": case_increase_rate,
-        "mortality_rate_30d": mortality_rate_30d,
-        "icu_rate_30d": icu_rate_30d,
-        "vaccination_rate": vaccination_rate,
-        "as_of": str(now.date()),
+        "label": epi_week_label(last["epi_year"], last["epi_week"]),
+        "cases": int(last["cases"]),
+        "prev_cases": int(last["prev_cases"]),
+        "case_increase_rate": float(last["case_increase_rate"]),
+        "mortality_rate": float(last["mortality_rate"]),
+        "icu_rate": float(last["icu_rate"]),
     }
+
+
+def build_metrics_frame(sums: dict, index: pd.Index) -> pd.DataFrame:
+    """Métricas registradas a partir de somas de janela já calculadas.
+
+    `sums` é {janela: {coluna do cubo: vetor}}, com vetores alinhados a
+    `index`; retorna uma linha de métricas por elemento.
+    """
+    values = evaluate_metrics(lambda window, column: sums[window][column])
+    return pd.DataFrame(values, index=index)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+from graphlib import CycleError, TopologicalSorter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+from src.relatorio.agregados import CUBE_COLUMNS
+
+
+# Janelas das métricas: (dias antes de `as_of` do início, e do fim exclusivo).
+WINDOWS = {"last7": (7, 0), "prev7": (14, 7), "last30": (30, 0), "last12m": (365, 0)}
+
+# Registro: nome -> {"inputs", "compute", "kind"}. "kind" é "count" (inteiro),
+# "rate" (float) ou "intermediate" (reutilizado por outras métricas, fora da
+# saída). Entradas são outras entradas do registro ou somas de janela no
+# formato "<janela>.<coluna do cubo>", como "last30.deaths".
+METRIC_REGISTRY: Dict[str, dict] = {}
+
+# Incrementar quando a definição de alguma métrica registrada mudar.
+REGISTRY_VERSION = 1
+
+WindowSum = Callable[[str, str], np.ndarray]
+
+
+def register_metric(name: str, inputs: Sequence[str], kind: str = "rate"):
+    """Decorador que registra uma métrica calculada a partir de `inputs`.
+
+    A função recebe os vetores das entradas, na ordem declarada, e devolve um
+    vetor (uma posição por data de referência ou estrato).
+    """
+    if kind not in ("count", "rate", "intermediate"):
+        raise ValueError(f"Tipo de métrica inválido: {kind}")
+
+    def decorator(fn):
+        METRIC_REGISTRY[name] = {"inputs": tuple(inputs), "compute": fn, "kind": kind}
+        return fn
+
+    return decorator
+
+
+def _ratio(n: np.ndarray, d: np.ndarray) -> np.ndarray:
+    # Divisão vetorizada; denominador zero dá 0.0.
+    out = np.zeros(len(n), dtype=np.float64)
+    np.divide(n, d, out=out, where=d != 0, casting="unsafe")
+    return out
+
+
+def _is_window_input(name: str) -> bool:
+    window, _, column = name.partition(".")
+    return window in WINDOWS and column in CUBE_COLUMNS
+
+
+def output_metrics(names: Optional[Iterable[str]] = None) -> List[str]:
+    """Métricas de saída (sem as intermediárias), na ordem de registro."""
+    names = list(METRIC_REGISTRY) if names is None else list(names)
+    return [n for n in names if METRIC_REGISTRY[n]["kind"] != "intermediate"]
+
+
+def _dependency_graph(names: Iterable[str]) -> Dict[str, tuple]:
+    graph: Dict[str, tuple] = {}
+    pending = list(names)
+    while pending:
+        node = pending.pop()
+        if node in graph:
+            continue
+        if _is_window_input(node):
+            graph[node] = ()
+            continue
+        if node not in METRIC_REGISTRY:
+            raise ValueError(f"Entrada de métrica desconhecida: {node}")
+        graph[node] = METRIC_REGISTRY[node]["inputs"]
+        pending.extend(graph[node])
+    return graph
+
+
+def window_inputs(name: str) -> List[str]:
+    """Somas de janela das quais a métrica depende, direta ou indiretamente."""
+    return sorted(n for n in _dependency_graph([name]) if _is_window_input(n))
+
+
+def evaluate_metrics(
+    window_sum: WindowSum, names: Optional[Iterable[str]] = None
+) -> Dict[str, np.ndarray]:
+    """Avalia as métricas registradas sobre um grafo de dependências.
+
+    `window_sum(janela, coluna)` fornece as somas de janela (vetores); cada
+    soma e cada intermediária é calculada uma única vez, em ordem topológica,
+    e compartilhada por todas as métricas que a usam. Retorna
+    {métrica: vetor} para as métricas de saída pedidas (padrão: todas).
+    """
+    names = output_metrics(names)
+    try:
+        order = list(TopologicalSorter(_dependency_graph(names)).static_order())
+    except CycleError as exc:
+        raise ValueError(f"Ciclo entre métricas registradas: {exc.args[1]}") from exc
+
+    values: Dict[str, np.ndarray] = {}
+    for node in order:
+        if _is_window_input(node):
+            values[node] = window_sum(*node.split("."))
+        else:
+            spec = METRIC_REGISTRY[node]
+            values[node] = spec["compute"](*(values[i] for i in spec["inputs"]))
+    return {name: values[name] for name in names}
+
+
+@register_metric("last7_cases", ["last7.cases"], kind="count")
+def _last7_cases(cases):
+    return cases
+
+
+@register_metric("prev7_cases", ["prev7.cases"], kind="count")
+def _prev7_cases(cases):
+    return cases
+
+
+@register_metric("case_increase_rate", ["last7.cases", "prev7.cases"])
+def _case_increase_rate(last7, prev7):
+    return _ratio(last7 - prev7, np.where(prev7 != 0, prev7, 1))
+
+
+@register_metric("mortality_rate_30d", ["last30.deaths", "last30.cases"])
+def _mortality_rate_30d(deaths, cases):
+    return _ratio(deaths, cases)
+
+
+@register_metric("icu_rate_30d", ["last30.icu", "last30.cases"])
+def _icu_rate_30d(icu, cases):
+    return _ratio(icu, cases)
+
+
+@register_metric(
+    "vaccination_denominator",
+    ["last12m.vaccination_known", "last12m.cases"],
+    kind="intermediate",
+)
+def _vaccination_denominator(known, cases):
+    # Sem nenhuma informação de vacinação, o denominador volta a ser o total.
+    return np.where(known != 0, known, cases)
+
+
+@register_metric("vaccination_rate", ["last12m.vaccinated", "vaccination_denominator"])
+def _vaccination_rate(vaccinated, denominator):
+    return _ratio(vaccinated, denominator)
+
+
+# Métricas centrais (de saída), na ordem dos dicionários de métricas.
+CORE_METRICS = output_metrics()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+
+# Semana epidemiológica (SE): vai de domingo a sábado; a SE 1 do ano é a que
+# contém 4 de janeiro (a primeira com ao menos quatro dias no ano).
+
+# 1970-01-01 foi uma quinta-feira; somar 4 dá o dia da semana com domingo = 0.
+_SUNDAY_OFFSET = 4
+
+
+def _as_days(dates) -> np.ndarray:
+    return np.asarray(pd.to_datetime(dates), dtype="datetime64[D]")
+
+
+def epi_week_start(days: np.ndarray) -> np.ndarray:
+    """Domingo que abre a SE de cada dia (datetime64[D])."""
+    ordinal = days.astype(np.int64)
+    return (ordinal - (ordinal + _SUNDAY_OFFSET) % 7).astype("datetime64[D]")
+
+
+def epi_weeks(dates) -> Tuple[np.ndarray, np.ndarray]:
+    """(ano epidemiológico, SE) de cada data, vetorizado.
+
+    A quarta-feira da semana cai sempre no ano da SE, e a quarta-feira da
+    SE 1 cai entre 1º e 7 de janeiro; logo a SE é o dia do ano dessa
+    quarta-feira dividido por 7.
+    """
+    wednesday = epi_week_start(_as_days(dates)) + np.timedelta64(3, "D")
+    year = wednesday.astype("datetime64[Y]")
+    day_of_year = (wednesday - year.astype("datetime64[D]")).astype(np.int64)
+    return year.astype(np.int64) + 1970, day_of_year // 7 + 1
+
+
+def build_epi_calendar(start, end) -> dict:
+    """Tabela pré-calculada dia -> (ano, SE) de `start` a `end` (inclusive).
+
+    Retorna o primeiro dia (`first`, datetime64[D]) e os vetores `year` e
+    `week`, um por dia; `lookup_epi_weeks` consulta a tabela por
+    deslocamento, sem aritmética de calendário por data.
+    """
+    first, last = _as_days([start, end])
+    days = np.arange(first, last + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    year, week = epi_weeks(days)
+    return {"first": first, "year": year, "week": week}
+
+
+def lookup_epi_weeks(calendar: dict, dates) -> Tuple[np.ndarray, np.ndarray]:
+    """(ano, SE) de cada data pela tabela de `build_epi_calendar`."""
+    offset = (_as_days(dates) - calendar["first"]).astype(np.int64)
+    if len(offset) and (offset.min() < 0 or offset.max() >= len(calendar["year"])):
+        raise ValueError("Datas fora do intervalo do calendário epidemiológico")
+    return calendar["year"][offset], calendar["week"][offset]
+
+
+def epi_week_label(year: int, week: int) -> str:
+    return f"SE {int(week):02d}/{int(year)}"
@@ -0,0 +1,3 @@
+from src.relatorio.agregados import CUBE_COLUMNS, build_daily_cube
+
+__all__ = ["CUBE_COLUMNS", "build_daily_cube"]
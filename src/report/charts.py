@@ -1,3 +1,17 @@
-from src.relatorio.graficos import generate_charts
+from src.relatorio.graficos import (
+    daily_chart_jobs,
+    generate_charts,
+    generate_charts_from_daily,
+    generate_weekly_chart,
+    render_chart_jobs,
+    weekly_chart_job,
+)
 
-__all__ = ["generate_charts"]
+__all__ = [
+    "daily_chart_jobs",
+    "generate_charts",
+    "generate_charts_from_daily",
+    "generate_weekly_chart",
+    "render_chart_jobs",
+    "weekly_chart_job",
+]
@@ -0,0 +1,13 @@
+from src.relatorio.atraso import (
+    build_delay_matrix,
+    completeness_adjusted_metrics,
+    completeness_adjusted_series,
+    delay_histogram_by_week,
+)
+
+__all__ = [
+    "build_delay_matrix",
+    "completeness_adjusted_metrics",
+    "completeness_adjusted_series",
+    "delay_histogram_by_week",
+]
@@ -0,0 +1,8 @@
+from src.relatorio.semana_epi import (
+    build_epi_calendar,
+    epi_week_label,
+    epi_weeks,
+    lookup_epi_weeks,
+)
+
+__all__ = ["build_epi_calendar", "epi_week_label", "epi_weeks", "lookup_epi_weeks"]
@@ -1,3 +1,15 @@
-from src.relatorio.metricas import compute_core_metrics
+from src.relatorio.metricas import (
+    backfill_core_metrics,
+    compute_core_metrics,
+    compute_metrics_from_cube,
+    compute_weekly_metrics,
+    weekly_summary,
+)
 
-__all__ = ["compute_core_metrics"]
+__all__ = [
+    "backfill_core_metrics",
+    "compute_core_metrics",
+    "compute_metrics_from_cube",
+    "compute_weekly_metrics",
+    "weekly_summary",
+]
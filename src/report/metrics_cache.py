@@ -0,0 +1,3 @@
+from src.relatorio.cache_metricas import cached_metrics_from_cube
+
+__all__ = ["cached_metrics_from_cube"]
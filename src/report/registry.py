@@ -0,0 +1,8 @@
+from src.relatorio.registro import (
+    CORE_METRICS,
+    METRIC_REGISTRY,
+    evaluate_metrics,
+    register_metric,
+)
+
+__all__ = ["CORE_METRICS", "METRIC_REGISTRY", "evaluate_metrics", "register_metric"]
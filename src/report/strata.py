@@ -0,0 +1,13 @@
+from src.relatorio.estratos import (
+    STRATA_COLUMNS,
+    check_stratified_guardrails,
+    compute_stratified_metrics,
+    stratified_records,
+)
+
+__all__ = [
+    "STRATA_COLUMNS",
+    "check_stratified_guardrails",
+    "compute_stratified_metrics",
+    "stratified_records",
+]
@@ -1,3 +1,3 @@
-from src.relatorio.escritor import write_markdown_report
+from src.relatorio.escritor import write_markdown_report, write_quality_profile
 
-__all__ = ["write_markdown_report"]
+__all__ = ["write_markdown_report", "write_quality_profile"]
@@ -4,9 +4,10 @@ from pathlib import Path
 from typing import Optional
 import secrets
 
+from src.configuracao import ensure_dir
+
 
 STORE_PATH = Path(__file__).resolve().parents[1] / "data" / "tokens.json"
-STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
 def _load_store() -> dict:
@@ -19,6 +20,7 @@ def _load_store() -> dict:
 
 
 def _save_store(store: dict) -> None:
+    ensure_dir(STORE_PATH.parent)
     STORE_PATH.write_text(
         json.dumps(store, ensure_ascii=False, indent=2), encoding="utf-8"
     )
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from src.relatorio.agregados import build_daily_cube
+from src.relatorio.atraso import (
+    build_delay_matrix,
+    completeness_adjusted_metrics,
+    completeness_adjusted_series,
+    delay_histogram_by_week,
+    reporting_completeness,
+)
+
+AS_OF = pd.Timestamp("2026-03-01")
+
+
+def _frame(rows):
+    # (início dos sintomas, atraso até a notificação em dias ou None)
+    onset = pd.to_datetime([d for d, _ in rows])
+    notified = [
+        pd.NaT if lag is None else d + pd.Timedelta(days=lag)
+        for d, lag in zip(onset, (lag for _, lag in rows))
+    ]
+    df = pd.DataFrame({"dt_sin_pri": onset, "dt_notific": pd.to_datetime(notified)})
+    df["case_date"] = df["dt_sin_pri"]
+    return df
+
+
+def test_delay_matrix_counts_each_case_once():
+    df = _frame(
+        [
+            ("2026-01-05", 0),
+            ("2026-01-05", 2),
+            ("2026-01-05", 40),
+            ("2026-01-06", 1),
+            ("2026-01-06", None),
+            ("2026-01-07", -3),
+        ]
+    )
+
+    matrix = build_delay_matrix(df, max_delay=3)
+
+    assert list(matrix.columns) == [0, 1, 2, 3]
+    assert matrix.loc["2026-01-05"].tolist() == [1, 0, 1, 1]
+    assert matrix.loc["2026-01-06"].tolist() == [0, 1, 0, 0]
+    assert "2026-01-07" not in matrix.index
+
+    weekly = delay_histogram_by_week(matrix)
+    assert (weekly["epi_year"][0], weekly["epi_week"][0]) == (2026, 1)
+    assert weekly[[0, 1, 2, 3]].to_numpy().sum() == 4
+
+
+def test_recent_counts_are_scaled_by_completeness():
+    mature = [(f"2026-01-{d:02d}", lag) for d in range(1, 21) for lag in (0, 1)]
+    recent = [("2026-02-28", 0), ("2026-02-27", 0), ("2026-02-27", 1)]
+    df = _frame(mature + recent)
+    cube = build_daily_cube(df)
+    matrix = build_delay_matrix(df, max_delay=3)
+
+    completeness = reporting_completeness(matrix, AS_OF)
+    adjusted = completeness_adjusted_series(cube, matrix, AS_OF)
+    metrics = completeness_adjusted_metrics(cube, matrix, AS_OF)
+
+    np.testing.assert_allclose(completeness, [0.5, 1.0, 1.0, 1.0])
+    # Véspera de as_of: só o atraso 0 é observável, metade dos casos.
+    assert adjusted["2026-02-28"] == 2.0
+    assert adjusted["2026-02-27"] == 2.0
+    assert adjusted["2026-01-10"] == 2.0
+    assert metrics["last7_cases_adjusted"] == 4.0
+    assert metrics["last7_completeness"] == 0.75
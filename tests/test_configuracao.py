@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.skipif((ROOT / ".env").is_file(), reason="o projeto tem .env próprio")
+def test_env_file_falls_back_to_working_directory(tmp_path):
+    (tmp_path / ".env").write_text("NEWS_QUERY=Influenza\n", encoding="utf-8")
+    workdir = tmp_path / "sub"
+    workdir.mkdir()
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "GOVERNANCE_ENABLED": "0"}
+    env.pop("NEWS_QUERY", None)
+    code = (
+        "import json, sys; import src.configuracao as c\n"
+        "print(json.dumps([c.NEWS_QUERY, str(c._ENV_FILE), 'dotenv' in sys.modules]))"
+    )
+
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert json.loads(out) == ["Influenza", str(tmp_path / ".env"), True]
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import src.dados.ingestao as ingestao
+import src.dados.limpeza as limpeza
+import src.relatorio.estratos as estratos
+from src.dados.limpeza import load_and_clean_srag
+from src.relatorio.estratos import compute_stratified_metrics, stratified_records
+from src.relatorio.metricas import compute_core_metrics
+
+
+# (dias atrás, UF, idade, unidade da idade, evolucao)
+ROWS = [
+    (1, "SP", "34", "3", "2"),
+    (2, "SP", "8", "2", "1"),
+    (3, "SP", "70", "3", "1"),
+    (5, "SP", "41", "3", "2"),
+    (6, "SP", "3", "3", "1"),
+    (9, "SP", "19", "3", "1"),
+    (12, "RJ", "85", "3", "2"),
+    (20, "RJ", "55", "", "1"),
+    (40, "AC", "", "", "1"),
+]
+
+
+@pytest.fixture(autouse=True)
+def no_audit(monkeypatch):
+    for mod in (ingestao, limpeza, estratos):
+        monkeypatch.setattr(mod, "audit", lambda *a, **k: None)
+
+
+@pytest.fixture
+def cleaned(tmp_path):
+    today = datetime.utcnow().date()
+    lines = ["DT_NOTIFIC;SG_UF_NOT;NU_IDADE_N;TP_IDADE;EVOLUCAO;UTI"]
+    for days, uf, idade, tp, evolucao in ROWS:
+        date = (today - timedelta(days=days)).strftime("%d/%m/%Y")
+        lines.append(f"{date};{uf};{idade};{tp};{evolucao};2")
+    csv = tmp_path / "srag.csv"
+    csv.write_text("\n".join(lines) + "\n", encoding="latin-1")
+    return load_and_clean_srag(csv, use_cache=False)
+
+
+def test_age_band_replaces_sensitive_age(cleaned):
+    # Por case_date: do mais antigo (40 dias) ao mais recente.
+    bands = cleaned.sort_values("case_date", kind="stable")["age_band"].tolist()
+
+    assert "nu_idade_n" not in cleaned.columns
+    assert pd.isna(bands[0])
+    assert bands[1:] == [
+        "40-59",
+        "80+",
+        "5-19",
+        "0-4",
+        "40-59",
+        "60-79",
+        "0-4",
+        "20-39",
+    ]
+
+
+def test_stratified_metrics_match_per_stratum_metrics(cleaned):
+    table = compute_stratified_metrics(cleaned, "sg_uf_not", min_cell=0)
+
+    for record in stratified_records(table):
+        stratum = cleaned[cleaned["sg_uf_not"] == record.pop("sg_uf_not")]
+        record.pop("suppressed")
+        assert record == compute_core_metrics(stratum)
+
+
+def test_stratified_metrics_suppress_small_cells(cleaned):
+    table = compute_stratified_metrics(cleaned, "sg_uf_not", min_cell=3)
+    records = {r["sg_uf_not"]: r for r in stratified_records(table)}
+
+    assert records["SP"]["last7_cases"] == 5
+    assert records["SP"]["prev7_cases"] is None
+    assert records["SP"]["case_increase_rate"] is None
+    assert records["SP"]["vaccination_rate"] == 0.0
+    assert records["RJ"]["mortality_rate_30d"] is None
+    assert records["AC"]["last7_cases"] == 0
+    assert records["AC"]["suppressed"]
+
+
+def test_single_suppressed_cell_gets_a_complement(cleaned):
+    # Com min_cell=2, só RJ (1 óbito em 30 dias) e AC (1 caso em 12 meses)
+    # caem na regra; o total nacional menos os outros estratos os revelaria.
+    table = compute_stratified_metrics(cleaned, "sg_uf_not", min_cell=2)
+    records = {r["sg_uf_not"]: r for r in stratified_records(table)}
+
+    assert records["RJ"]["mortality_rate_30d"] is None
+    assert records["SP"]["mortality_rate_30d"] is None
+    assert records["AC"]["mortality_rate_30d"] == 0.0
+    assert records["AC"]["vaccination_rate"] is None
+    assert records["RJ"]["vaccination_rate"] is None
+    assert records["SP"]["vaccination_rate"] == 0.0
+    for metric in table.columns.drop(["sg_uf_not", "suppressed", "as_of"]):
+        assert table[metric].isna().sum() != 1
+
+
+def test_stratified_metrics_reject_sensitive_fields(cleaned):
+    with pytest.raises(ValueError, match="sensível"):
+        compute_stratified_metrics(cleaned, "nu_idade_n")
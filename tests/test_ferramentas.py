@@ -0,0 +1,100 @@
+import threading
+import time
+import urllib.parse
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import src.agente.ferramentas as ferramentas
+
+
+def _rss(query):
+    now = datetime.now(timezone.utc)
+    items = [
+        (f"{query} 1", f"http://noticias/{query}/1", now),
+        ("Compartilhada", "http://noticias/comum", now - timedelta(hours=1)),
+        (f"{query} antiga", f"http://noticias/{query}/2", now - timedelta(days=60)),
+    ]
+    body = "".join(
+        f"<item><title>{t}</title><link>{u}</link>"
+        f"<pubDate>{format_datetime(d)}</pubDate></item>"
+        for t, u, d in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{body}</channel></rss>'
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("If-None-Match"))
+        time.sleep(server.delay)
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)["q"][0]
+        etag = f'"{query}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = _rss(query).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server(tmp_path, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.daemon_threads = True
+    server.requests, server.delay = [], 0.0
+    # Clientes que desistem por prazo deixam o socket fechado.
+    server.handle_error = lambda *args: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        ferramentas,
+        "NEWS_FEED_URL",
+        f"http://127.0.0.1:{server.server_port}/rss?q={{q}}",
+    )
+    monkeypatch.setattr(ferramentas, "PROCESSED_DIR", tmp_path)
+    monkeypatch.setattr(ferramentas, "audit", lambda *a, **k: None)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_news_search_merges_queries_and_revalidates_cache(feed_server, monkeypatch):
+    queries = ferramentas.news_queries("SRAG,Brasil; Influenza ;")
+    assert queries == ["SRAG,Brasil", "Influenza"]
+
+    first = ferramentas.news_search(queries=queries, timeout=2)
+    assert [n["title"] for n in first] == [
+        "SRAG,Brasil 1",
+        "Influenza 1",
+        "Compartilhada",
+    ]
+    assert feed_server.requests == [None, None]
+
+    # Dentro do TTL, nenhuma requisição; vencido, revalida com ETag (304).
+    assert ferramentas.news_search(queries=queries, timeout=2) == first
+    assert len(feed_server.requests) == 2
+    monkeypatch.setattr(ferramentas, "NEWS_CACHE_TTL", 0)
+    assert ferramentas.news_search(queries=queries, timeout=2) == first
+    assert sorted(feed_server.requests[2:]) == ['"Influenza"', '"SRAG,Brasil"']
+
+
+def test_news_search_falls_back_to_cache_when_feed_is_slow(feed_server, monkeypatch):
+    monkeypatch.setattr(ferramentas, "_PARSE_GRACE", 0.2)
+    cached = ferramentas.news_search(queries=["SRAG"], timeout=2)
+
+    monkeypatch.setattr(ferramentas, "NEWS_CACHE_TTL", 0)
+    feed_server.delay = 1.5
+    start = time.monotonic()
+    assert ferramentas.news_search(queries=["SRAG"], timeout=0.3) == cached
+    assert ferramentas.news_search(queries=["COVID"], timeout=0.3) == []
+    assert time.monotonic() - start < 2.0
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import src.relatorio.graficos as graficos
+from src.relatorio.agregados import CUBE_COLUMNS
+from src.relatorio.metricas import compute_weekly_metrics
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _jobs(backend="png"):
+    index = pd.date_range(end=pd.Timestamp.utcnow().normalize(), periods=400, freq="D")
+    cube = pd.DataFrame(
+        {c: (index.dayofyear % 11 + 1).to_numpy() for c in CUBE_COLUMNS},
+        index=pd.DatetimeIndex(index.tz_localize(None), name="case_date"),
+    )
+    return graficos.daily_chart_jobs(cube["cases"], backend) + [
+        graficos.weekly_chart_job(compute_weekly_metrics(cube), backend=backend)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def no_audit(monkeypatch):
+    monkeypatch.setattr(graficos, "audit", lambda *a, **k: None)
+
+
+def test_parallel_render_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(graficos, "REPORTS_DIR", tmp_path / "serial")
+    serial = graficos.render_chart_jobs(_jobs(), max_workers=1, use_cache=False)
+    monkeypatch.setattr(graficos, "REPORTS_DIR", tmp_path / "parallel")
+    parallel = graficos.render_chart_jobs(_jobs(), max_workers=3, use_cache=False)
+
+    assert [p.name for p in parallel] == [p.name for p in serial]
+    for a, b in zip(serial, parallel):
+        assert a.read_bytes() == b.read_bytes()
+    # Nada passa pelo estado global do pyplot.
+    assert "plt" not in vars(graficos)
+
+
+def test_chart_cache_reuses_unchanged_renders(tmp_path, monkeypatch):
+    events = []
+    monkeypatch.setattr(graficos, "audit", lambda e, d=None: events.append(d))
+    monkeypatch.setattr(graficos, "ASSETS_DIR", tmp_path / "recursos")
+    monkeypatch.setattr(graficos, "REPORTS_DIR", tmp_path / "relatorios")
+    rendered = []
+    render = graficos._render_job
+    monkeypatch.setattr(
+        graficos, "_render_job", lambda job: rendered.append(job[1]) or render(job)
+    )
+    jobs = _jobs()
+
+    first = [p.read_bytes() for p in graficos.render_chart_jobs(jobs, max_workers=1)]
+    second = [p.read_bytes() for p in graficos.render_chart_jobs(jobs, max_workers=1)]
+    monkeypatch.setitem(graficos.CHART_STYLE, "dpi", 72)
+    graficos.render_chart_jobs(jobs[:1], max_workers=1)
+
+    assert first == second
+    assert rendered == ["daily", "monthly", "weekly", "daily"]
+    assert [(e["hits"], e["misses"]) for e in events] == [(0, 3), (3, 0), (0, 1)]
+
+    monkeypatch.setattr(graficos, "CHART_CACHE_MAX_BYTES", 0)
+    graficos.render_chart_jobs(jobs[:1], max_workers=1)
+    assert not list((tmp_path / "recursos" / "graficos").glob("*.png"))
+
+
+def test_svg_backend_draws_one_mark_per_point(tmp_path, monkeypatch):
+    monkeypatch.setattr(graficos, "REPORTS_DIR", tmp_path)
+    jobs = _jobs("svg")
+
+    paths = graficos.render_chart_jobs(jobs, max_workers=1, use_cache=False)
+
+    ns = {"svg": "http://www.w3.org/2000/svg"}
+    marks = {"daily": "svg:circle", "monthly": "svg:rect", "weekly": "svg:rect"}
+    for (_, kind, data, title, _), path in zip(jobs, paths):
+        root = ET.parse(path).getroot()
+        assert path.suffix == ".svg"
+        # O primeiro retângulo é o fundo.
+        offset = 1 if kind != "daily" else 0
+        assert len(root.findall(marks[kind], ns)) == len(data) + offset
+        assert title in [t.text for t in root.findall("svg:text", ns)]
+
+
+def test_svg_backend_does_not_import_plotting_stack(tmp_path):
+    code = (
+        "import sys; from pathlib import Path; import pandas as pd\n"
+        "import src.relatorio.graficos as g\n"
+        "g.REPORTS_DIR = Path(sys.argv[1])\n"
+        "s = pd.Series([3, 5], index=pd.date_range(end=pd.Timestamp.today(),"
+        " periods=2, freq='D').normalize() - pd.Timedelta(days=1))\n"
+        "g.render_chart_jobs(g.daily_chart_jobs(s, 'svg'), use_cache=False)\n"
+        "assert 'matplotlib' not in sys.modules and 'seaborn' not in sys.modules\n"
+    )
+    env = {**os.environ, "GOVERNANCE_ENABLED": "0"}
+    subprocess.run(
+        [sys.executable, "-c", code, str(tmp_path)], cwd=ROOT, env=env, check=True
+    )
+    assert len(list(tmp_path.glob("*.svg"))) == 2
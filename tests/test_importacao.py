@@ -0,0 +1,11 @@
+import pytest
+
+from scripts.tempo_importacao import IMPORT_BUDGET_MS, heavy_imports, measure_imports
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_MS))
+def test_entry_points_import_within_budget(module):
+    timings = measure_imports(module)
+
+    assert heavy_imports(timings) == []
+    assert timings[module] / 1000 <= IMPORT_BUDGET_MS[module]
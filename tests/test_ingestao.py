@@ -0,0 +1,88 @@
+import gzip
+import zipfile
+
+import pandas as pd
+import pytest
+
+import src.dados.cache as cache
+import src.dados.ingestao as ingestao
+import src.dados.limpeza as limpeza
+from src.dados.ingestao import sniff_csv_layout
+from src.dados.limpeza import load_and_clean_srag
+
+
+DATASUS_CSV = (
+    " DT_NOTIFIC ;DT_SIN_PRI;EVOLUCAO;UTI;VACINA;DS_OBSERVACAO;CS_SEXO\n"
+    "2025-08-16;2025-08-14;2;1;1;Óbito em UTI;F\n"
+    "2025-08-15;;1;2;9;sem intercorrências;M\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def no_audit(monkeypatch, tmp_path):
+    monkeypatch.setattr(ingestao, "audit", lambda *a, **k: None)
+    monkeypatch.setattr(limpeza, "audit", lambda *a, **k: None)
+    monkeypatch.setattr(cache, "PROCESSED_DIR", tmp_path / "processados")
+
+
+def test_sniff_datasus_layout(tmp_path):
+    csv = tmp_path / "srag_datasus.csv"
+    csv.write_bytes(DATASUS_CSV.encode("latin-1"))
+
+    layout = sniff_csv_layout(csv)
+
+    assert layout["sep"] == ";"
+    assert layout["encoding"] == "latin-1"
+    assert layout["usecols"] == [
+        " DT_NOTIFIC ",
+        "DT_SIN_PRI",
+        "EVOLUCAO",
+        "UTI",
+        "VACINA",
+        "CS_SEXO",
+    ]
+    assert layout["canonical"]["dt_notific"] == " DT_NOTIFIC "
+    assert list(layout["canonical"].values()) == layout["usecols"]
+
+
+def test_load_reads_only_relevant_columns(tmp_path):
+    csv = tmp_path / "srag_datasus.csv"
+    csv.write_bytes(DATASUS_CSV.encode("latin-1"))
+
+    df = load_and_clean_srag(csv, use_cache=False)
+
+    assert "ds_observacao" not in df.columns
+    assert list(df.columns[:5]) == [
+        "dt_sin_pri",
+        "dt_notific",
+        "evolucao",
+        "uti",
+        "vacina",
+    ]
+    assert df["death_flag"].tolist() == [True, False]
+    assert df["icu_flag"].tolist() == [True, False]
+
+
+def test_compressed_and_zipped_sources_match_plain_csv(tmp_path, monkeypatch):
+    raw = DATASUS_CSV.encode("latin-1")
+    header, *rows = raw.splitlines(keepends=True)
+    (tmp_path / "srag.csv").write_bytes(raw)
+    (tmp_path / "srag_2024.csv.gz").write_bytes(gzip.compress(raw))
+    with zipfile.ZipFile(tmp_path / "srag_2025.zip", "w") as z:
+        z.writestr("parte1.csv", header + rows[0].rstrip(b"\n"))
+        z.writestr("parte2.csv", header + rows[1])
+        z.writestr("LEIAME.txt", "dicionário de dados")
+    monkeypatch.setattr(ingestao, "_srag_source_dirs", lambda: [tmp_path])
+
+    sources = ingestao.discover_srag_csvs()
+    expected = load_and_clean_srag(tmp_path / "srag.csv", use_cache=False)
+
+    assert [p.name for p in sources] == [
+        "srag.csv",
+        "srag_2024.csv.gz",
+        "srag_2025.zip",
+    ]
+    for path in sources[1:]:
+        assert sniff_csv_layout(path)["encoding"] == "latin-1"
+        df = load_and_clean_srag(path, use_cache=False, chunksize=1)
+        pd.testing.assert_frame_equal(df, expected)
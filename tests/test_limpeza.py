@@ -0,0 +1,251 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import src.dados.cache as cache
+import src.dados.ingestao as ingestao
+import src.dados.limpeza as limpeza
+from src.dados.codigos import flag_from_codes, is_death_code
+from src.dados.datas import parse_date_column
+from src.dados.limpeza import load_and_clean_srag
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_CSV = ROOT / "data" / "raw" / "SRAG_exemplo.csv"
+
+
+@pytest.fixture
+def audit_events(monkeypatch, tmp_path):
+    events = []
+    monkeypatch.setattr(cache, "PROCESSED_DIR", tmp_path / "processados")
+    for mod in (ingestao, limpeza):
+        monkeypatch.setattr(mod, "audit", lambda e, d=None: events.append((e, d)))
+    return events
+
+
+def _cache_statuses(events):
+    return [d["status"] for e, d in events if e == "clean_cache"]
+
+
+def test_clean_cache_miss_then_hit(audit_events, tmp_path):
+    csv = tmp_path / "srag.csv"
+    csv.write_bytes(SAMPLE_CSV.read_bytes())
+
+    first = load_and_clean_srag(csv)
+    second = load_and_clean_srag(csv)
+
+    assert _cache_statuses(audit_events) == ["miss", "hit"]
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_clean_cache_invalidated_when_source_changes(audit_events, tmp_path):
+    csv = tmp_path / "srag.csv"
+    csv.write_bytes(SAMPLE_CSV.read_bytes())
+    load_and_clean_srag(csv)
+
+    with open(csv, "a", encoding="utf-8") as f:
+        f.write("2025-08-17,2025-08-17,1,0,1,F,30\n")
+    df = load_and_clean_srag(csv)
+
+    assert _cache_statuses(audit_events) == ["miss", "miss"]
+    assert len(list((tmp_path / "processados").glob("srag.csv.*.parquet"))) == 1
+    assert len(df) == 11
+
+
+def test_clean_cache_bypass(audit_events, tmp_path):
+    csv = tmp_path / "srag.csv"
+    csv.write_bytes(SAMPLE_CSV.read_bytes())
+
+    load_and_clean_srag(csv, use_cache=False)
+
+    assert _cache_statuses(audit_events) == ["bypass"]
+    assert not (tmp_path / "processados").exists()
+
+
+def test_cached_frames_keep_compact_schema(audit_events, tmp_path):
+    # DT_EVOLUCA toda vazia vira categórica sem categorias, que o Parquet
+    # devolve como object.
+    csv = tmp_path / "srag.csv"
+    csv.write_text(
+        "DT_NOTIFIC;DT_EVOLUCA;EVOLUCAO\n10/08/2025;;1\n11/08/2025;;2\n",
+        encoding="latin-1",
+    )
+    fresh = load_and_clean_srag(csv, use_cache=False)
+
+    pd.testing.assert_frame_equal(load_and_clean_srag(csv), fresh)
+    pd.testing.assert_frame_equal(load_and_clean_srag(csv), fresh)
+
+    load_and_clean_srag(csv, incremental=True)
+    with open(csv, "a", encoding="latin-1") as f:
+        f.write("12/08/2025;;1\n")
+    appended = load_and_clean_srag(csv, incremental=True)
+
+    assert appended["dt_evoluca"].dtype == "category"
+    pd.testing.assert_series_equal(appended.dtypes, fresh.dtypes)
+
+
+def test_chunked_clean_matches_full_read(audit_events, tmp_path):
+    full = load_and_clean_srag(SAMPLE_CSV, use_cache=False)
+    chunked = load_and_clean_srag(SAMPLE_CSV, use_cache=False, chunksize=3)
+
+    pd.testing.assert_frame_equal(full, chunked)
+
+
+def test_parse_date_column_fast_path_and_fallback():
+    raw = pd.Series(["16/08/2025", "01/02/2025", "1/3/2025", "31/02/2025", None])
+
+    parsed, stats = parse_date_column(raw)
+
+    assert parsed.tolist()[:3] == [
+        pd.Timestamp("2025-08-16"),
+        pd.Timestamp("2025-02-01"),
+        pd.Timestamp("2025-03-01"),
+    ]
+    assert parsed.iloc[3:].isna().all()
+    assert stats == {"format": "dmy", "fast": 2, "fallback": 1, "unparsed": 1}
+
+
+def test_parse_date_column_mixed_formats():
+    raw = pd.Series(["2025-08-16", "17/08/2025"])
+
+    parsed, stats = parse_date_column(raw)
+
+    assert stats["format"] == "mixed"
+    assert stats["fast"] == 2
+    assert parsed.tolist() == [pd.Timestamp("2025-08-16"), pd.Timestamp("2025-08-17")]
+
+
+def test_parse_date_column_ignores_non_ascii_lookalikes():
+    # "ı" (U+0131) e "İ" (U+0130) terminam nos bytes de "1" e "0".
+    raw = pd.Series(["16/08/2025", "ı6/08/2025", "16/08/202İ"])
+
+    parsed, stats = parse_date_column(raw)
+
+    assert parsed.iloc[0] == pd.Timestamp("2025-08-16")
+    assert parsed.iloc[1:].isna().all()
+    assert stats == {"format": "dmy", "fast": 1, "fallback": 0, "unparsed": 2}
+
+
+def test_year_typo_becomes_nat_and_case_date_falls_back(audit_events, tmp_path):
+    parsed, stats = parse_date_column(pd.Series(["01/01/0202", "01/01/9999"] * 3))
+
+    assert parsed.isna().all()
+    assert stats["unparsed"] == 6
+
+    csv = tmp_path / "srag.csv"
+    csv.write_text(
+        "DT_NOTIFIC;DT_SIN_PRI;EVOLUCAO\n"
+        "10/08/2025;08/08/2025;1\n"
+        "11/08/2025;09/08/0202;1\n"
+        "12/08/2025;10/08/2025;1\n",
+        encoding="latin-1",
+    )
+    df = load_and_clean_srag(csv, use_cache=False)
+
+    # A linha com o ano digitado errado cai para DT_NOTIFIC.
+    assert sorted(df["case_date"]) == [
+        pd.Timestamp("2025-08-08"),
+        pd.Timestamp("2025-08-10"),
+        pd.Timestamp("2025-08-11"),
+    ]
+
+
+def test_flag_from_codes_classifies_each_category_once():
+    evolucao = pd.Series(["2", " 2 ", "2.0", "1", "3", "9", None, "Óbito"])
+    seen = []
+
+    def classify(code):
+        seen.append(code)
+        return is_death_code(code)
+
+    flags = flag_from_codes(evolucao, classify)
+
+    assert flags.tolist() == [True, True, True, False, False, False, False, True]
+    assert len(seen) == evolucao.nunique() + 1
+
+
+def _incremental_statuses(events):
+    return [d["status"] for e, d in events if e == "clean_incremental"]
+
+
+def test_incremental_append_matches_full_clean(audit_events, tmp_path):
+    csv = tmp_path / "srag.csv"
+    csv.write_bytes(SAMPLE_CSV.read_bytes())
+    load_and_clean_srag(csv, incremental=True)
+
+    with open(csv, "a", encoding="utf-8") as f:
+        f.write("2025-08-17,2025-08-17,1,0,1,F,30\n")
+    appended = load_and_clean_srag(csv, incremental=True)
+    unchanged = load_and_clean_srag(csv, incremental=True)
+
+    full = load_and_clean_srag(csv, use_cache=False)
+    pd.testing.assert_frame_equal(appended, full)
+    assert appended.attrs["quality"] == full.attrs["quality"]
+    pd.testing.assert_frame_equal(unchanged, appended)
+
+    csv.write_bytes(SAMPLE_CSV.read_bytes())
+    rebuilt = load_and_clean_srag(csv, incremental=True)
+
+    assert len(rebuilt) == len(appended) - 1
+    assert _incremental_statuses(audit_events) == [
+        "rebuild",
+        "append",
+        "unchanged",
+        "rebuild",
+    ]
+
+
+def test_clean_frame_has_compact_schema(audit_events):
+    df = load_and_clean_srag(SAMPLE_CSV, use_cache=False)
+    chunked = load_and_clean_srag(SAMPLE_CSV, use_cache=False, chunksize=3)
+
+    assert not set(limpeza.SENSITIVE_FIELDS) & set(df.columns)
+    assert df["evolucao"].dtype == "category"
+    assert df["death_flag"].dtype == bool
+    assert str(df["vaccinated_flag"].dtype) == "boolean"
+    pd.testing.assert_series_equal(df.dtypes, chunked.dtypes)
+
+    memory = [d for e, d in audit_events if e == "clean_memory"][0]
+    assert memory["bytes_after"] < memory["bytes_before"]
+
+
+def test_memory_before_compaction_is_estimated_from_a_sample(audit_events, monkeypatch):
+    load_and_clean_srag(SAMPLE_CSV, use_cache=False)
+    monkeypatch.setattr(limpeza, "MEMORY_SAMPLE_ROWS", 4)
+    load_and_clean_srag(SAMPLE_CSV, use_cache=False)
+
+    exact, sampled = [d for e, d in audit_events if e == "clean_memory"]
+    assert sampled["columns_before"].keys() == exact["columns_before"].keys()
+    assert sampled["bytes_before"] == pytest.approx(exact["bytes_before"], rel=0.1)
+    assert sampled["bytes_after"] == exact["bytes_after"]
+
+
+def test_quality_profile_counts_drops_nulls_codes_and_ranges(audit_events, tmp_path):
+    csv = tmp_path / "srag.csv"
+    csv.write_text(
+        "DT_NOTIFIC;DT_SIN_PRI;EVOLUCAO;UTI;VACINA\n"
+        "10/08/2025;08/08/2025;1;1;1\n"
+        "11/08/2025;;2.0;;9\n"
+        ";;1;2;\n"
+        "xx/08/2025;;1;1;1\n"
+        "01/01/1900;31/12/2099; óbito ;1;2\n",
+        encoding="latin-1",
+    )
+
+    profile = load_and_clean_srag(csv, use_cache=True).attrs["quality"]
+
+    assert profile["rows_read"] == 5
+    assert profile["rows_kept"] == 3
+    assert profile["dropped"] == {"missing_dates": 1, "unparseable_dates": 1}
+    assert profile["nulls"]["dt_sin_pri"] == 3
+    assert profile["unparseable"]["dt_notific"] == 1
+    assert profile["codes"]["evolucao"] == {"1": 3, "2": 1, "ÓBITO": 1}
+    assert profile["codes"]["vacina"] == {"1": 2, "2": 1, "9": 1, "<vazio>": 1}
+    assert profile["out_of_range_dates"]["dt_notific"]["before_min"] == 1
+    assert profile["out_of_range_dates"]["dt_sin_pri"]["future"] == 1
+
+    # O perfil volta junto com o cache e não depende da leitura em blocos.
+    assert load_and_clean_srag(csv).attrs["quality"] == profile
+    chunked = load_and_clean_srag(csv, use_cache=False, chunksize=2)
+    assert chunked.attrs["quality"] == profile
+    assert "quality_profile" in [e for e, _ in audit_events]
@@ -0,0 +1,259 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.dados.cache as cache
+import src.dados.ingestao as ingestao
+import src.dados.limpeza as limpeza
+import src.dados.motor_duckdb as motor_duckdb
+import src.dados.motor_streaming as motor_streaming
+import src.relatorio.cache_metricas as cache_metricas
+import src.relatorio.metricas as metricas
+import src.relatorio.registro as registro
+from src.dados.limpeza import load_and_clean_many, load_and_clean_srag
+from src.dados.motor_duckdb import run_duckdb_engine
+from src.dados.motor_streaming import stream_core_metrics
+from src.relatorio.agregados import CUBE_COLUMNS, build_daily_cube
+from src.relatorio.cache_metricas import cached_metrics_from_cube
+from src.relatorio.metricas import (
+    backfill_core_metrics,
+    compute_core_metrics,
+    compute_metrics_from_cube,
+)
+
+
+# (dias atrás, evolucao, uti, vacina)
+ROWS = [
+    (1, "2", "1", "1"),
+    (2, "1", "2", "2"),
+    (3, "1", "1", "9"),
+    (6, "3", "2", "1"),
+    (8, "1", "2", ""),
+    (10, "2", "1", "1"),
+    (20, "Óbito", "2", "2"),
+    (29, "1", "9", "1"),
+    (45, "2", "1", "1"),
+    (200, "1", "2", "2"),
+    (400, "2", "1", "1"),
+]
+
+
+def _write_datasus_csv(path: Path) -> Path:
+    today = datetime.utcnow().date()
+    lines = ["DT_NOTIFIC;DT_SIN_PRI;EVOLUCAO;UTI;VACINA;CS_SEXO"]
+    for i, (days, evolucao, uti, vacina) in enumerate(ROWS):
+        date = (today - timedelta(days=days)).strftime("%d/%m/%Y")
+        sin_pri = "" if i % 3 == 0 else date
+        lines.append(f"{date};{sin_pri};{evolucao};{uti};{vacina};F")
+    path.write_bytes(("\n".join(lines) + "\n").encode("latin-1"))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def no_audit(monkeypatch):
+    for mod in (ingestao, limpeza, motor_duckdb, motor_streaming):
+        monkeypatch.setattr(mod, "audit", lambda *a, **k: None)
+
+
+@pytest.fixture
+def datasus_csv(tmp_path):
+    return _write_datasus_csv(tmp_path / "srag.csv")
+
+
+def test_core_metrics_windows(datasus_csv):
+    metrics = compute_core_metrics(load_and_clean_srag(datasus_csv, use_cache=False))
+
+    assert metrics["last7_cases"] == 4
+    assert metrics["prev7_cases"] == 2
+    assert metrics["mortality_rate_30d"] == pytest.approx(3 / 8)
+    assert metrics["icu_rate_30d"] == pytest.approx(3 / 8)
+    assert metrics["vaccination_rate"] == pytest.approx(5 / 10)
+
+
+def test_core_metrics_do_not_depend_on_row_order(datasus_csv):
+    df = load_and_clean_srag(datasus_csv, use_cache=False)
+
+    assert compute_core_metrics(df.sample(frac=1, random_state=7)) == (
+        compute_core_metrics(df)
+    )
+
+
+def test_daily_cube_aggregates_one_row_per_day(datasus_csv):
+    df = load_and_clean_srag(datasus_csv, use_cache=False)
+
+    cube = build_daily_cube(df)
+
+    assert list(cube.columns) == CUBE_COLUMNS
+    assert len(cube) == len(ROWS)
+    assert cube.index.is_monotonic_increasing
+    assert cube.sum().to_dict() == {
+        "cases": 11,
+        "deaths": 5,
+        "icu": 5,
+        "vaccination_known": 11,
+        "vaccinated": 6,
+    }
+    assert compute_metrics_from_cube(cube) == compute_core_metrics(df)
+
+
+def test_duckdb_engine_matches_pandas(datasus_csv):
+    # Anos digitados errado em DT_SIN_PRI caem para DT_NOTIFIC nos dois motores.
+    notific = (datetime.utcnow().date() - timedelta(days=1)).strftime("%d/%m/%Y")
+    with open(datasus_csv, "a", encoding="latin-1") as f:
+        f.write(f"{notific};01/01/0202;1;1;1;F\n{notific};01/01/2999;2;2;2;M\n")
+    df = load_and_clean_srag(datasus_csv, use_cache=False)
+
+    metrics, cube = run_duckdb_engine(datasus_csv)
+
+    assert metrics == compute_core_metrics(df)
+    pd.testing.assert_frame_equal(cube, build_daily_cube(df))
+
+
+def test_duckdb_engine_reads_typed_parquet(datasus_csv, tmp_path, monkeypatch):
+    # O cache dos dados limpos tem datas em timestamp e códigos categóricos.
+    monkeypatch.setattr(cache, "PROCESSED_DIR", tmp_path / "processados")
+    df = load_and_clean_srag(datasus_csv)
+    (parquet,) = (tmp_path / "processados").glob("*.parquet")
+
+    metrics, cube = run_duckdb_engine(parquet)
+
+    assert metrics == compute_core_metrics(df)
+    pd.testing.assert_frame_equal(cube, build_daily_cube(df))
+
+
+def test_duckdb_engine_matches_pandas_on_messy_dates(tmp_path):
+    # Os dois motores reconhecem os mesmos formatos; o que nenhum aceita
+    # (mês 13, barras no ISO, ano com dois dígitos) cai para DT_NOTIFIC.
+    today = datetime.utcnow().date()
+    forms = [
+        "%d-%m-%Y",
+        "%Y%m%d",
+        "%m/%d/%Y",
+        " %d/%m/%Y ",
+        "%Y-%m-%dT10:30:00",
+        "%Y-%m-%d %H:%M:%S",
+        "%d/%m/%y",
+        "%Y/%m/%d",
+    ]
+    lines = ["DT_NOTIFIC;DT_SIN_PRI;EVOLUCAO;UTI"]
+    for i in range(60):
+        sin_pri = today - timedelta(days=i % 40)
+        notific = (sin_pri + timedelta(days=3)).strftime("%d/%m/%Y")
+        lines.append(f"{notific};{sin_pri.strftime(forms[i % len(forms)])};{i % 3};1")
+    csv = tmp_path / "srag.csv"
+    csv.write_text("\n".join(lines) + "\n", encoding="latin-1")
+
+    df = load_and_clean_srag(csv, use_cache=False)
+    metrics, cube = run_duckdb_engine(csv)
+
+    assert metrics == compute_core_metrics(df)
+    pd.testing.assert_frame_equal(cube, build_daily_cube(df))
+
+
+def test_multi_file_merge_matches_duckdb(tmp_path):
+    first = _write_datasus_csv(tmp_path / "srag_2025.csv")
+    second = tmp_path / "srag_2026.csv"
+    second.write_text(
+        "dt_notific,evolucao,uti\n"
+        f"{(datetime.utcnow().date() - timedelta(days=2)).isoformat()},2,1\n",
+        encoding="utf-8",
+    )
+
+    df = load_and_clean_many([first, second], use_cache=False, max_workers=2)
+    metrics, _ = run_duckdb_engine([first, second])
+
+    assert len(df) == 12
+    assert str(df["vaccinated_flag"].dtype) == "boolean"
+    assert df["vaccinated_flag"].isna().sum() == 1
+    assert metrics == compute_core_metrics(df)
+
+
+def test_streaming_metrics_match_cleaned_frame(tmp_path):
+    first = _write_datasus_csv(tmp_path / "srag_2025.csv")
+    second = tmp_path / "srag_2026.csv"
+    second.write_text(
+        "dt_notific,evolucao,uti,vacina\n"
+        f"{(datetime.utcnow().date() - timedelta(days=2)).isoformat()},2,1,\n"
+        "sem data,1,1,1\n",
+        encoding="utf-8",
+    )
+    df = load_and_clean_many([first, second], use_cache=False, max_workers=2)
+
+    for chunksize in (1, 4, 1000):
+        metrics = stream_core_metrics([first, second], chunksize=chunksize)
+        assert metrics == compute_core_metrics(df)
+
+    as_of = datetime.utcnow().date() - timedelta(days=10)
+    assert stream_core_metrics(first, as_of=as_of) == compute_core_metrics(
+        load_and_clean_srag(first, use_cache=False), as_of=as_of
+    )
+
+
+def test_backfill_matches_metrics_for_each_as_of(datasus_csv):
+    cube = build_daily_cube(load_and_clean_srag(datasus_csv, use_cache=False))
+    today = datetime.utcnow().date()
+
+    history = backfill_core_metrics(cube, today - timedelta(days=420), today)
+
+    assert len(history) == 421
+    for as_of in history.index[::7].append(history.index[-1:]):
+        expected = compute_metrics_from_cube(cube, as_of=as_of)
+        assert expected.pop("as_of") == str(as_of.date())
+        assert history.loc[as_of].to_dict() == expected
+
+
+def test_registered_metric_shares_window_sums(datasus_csv, monkeypatch):
+    monkeypatch.setattr(registro, "METRIC_REGISTRY", dict(registro.METRIC_REGISTRY))
+    monkeypatch.setattr(metricas, "METRIC_REGISTRY", registro.METRIC_REGISTRY)
+    registro.register_metric("deaths_per_icu_30d", ["last30.deaths", "last30.icu"])(
+        lambda deaths, icu: registro._ratio(deaths, icu)
+    )
+    cube = build_daily_cube(load_and_clean_srag(datasus_csv, use_cache=False))
+    today = np.array([pd.Timestamp(datetime.utcnow().date())], dtype="datetime64[ns]")
+    cube_sum = metricas._cube_window_sum(metricas.build_cube_index(cube), today)
+    calls = []
+
+    def window_sum(window, column):
+        calls.append((window, column))
+        return cube_sum(window, column)
+
+    values = registro.evaluate_metrics(window_sum)
+    metrics = compute_metrics_from_cube(cube)
+
+    assert len(calls) == len(set(calls)) == 8
+    assert values["deaths_per_icu_30d"][0] == pytest.approx(1.0)
+    assert metrics["deaths_per_icu_30d"] == pytest.approx(1.0)
+    assert list(metrics)[:6] == registro.CORE_METRICS
+
+
+def test_registry_rejects_cycles(monkeypatch):
+    monkeypatch.setattr(registro, "METRIC_REGISTRY", dict(registro.METRIC_REGISTRY))
+    registro.register_metric("a", ["b"])(lambda b: b)
+    registro.register_metric("b", ["a"])(lambda a: a)
+
+    with pytest.raises(ValueError, match="Ciclo"):
+        registro.evaluate_metrics(lambda w, c: np.zeros(1), ["a"])
+
+
+def test_metrics_cache_hits_and_evicts(datasus_csv, tmp_path, monkeypatch):
+    events = []
+    monkeypatch.setattr(cache_metricas, "PROCESSED_DIR", tmp_path / "processados")
+    monkeypatch.setattr(cache_metricas, "METRICS_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(cache_metricas, "audit", lambda e, d=None: events.append(d))
+    cube = build_daily_cube(load_and_clean_srag(datasus_csv, use_cache=False))
+    today = datetime.utcnow().date()
+
+    first = cached_metrics_from_cube(cube, use_cache=True)
+    second = cached_metrics_from_cube(cube, use_cache=True)
+    for days in (1, 2):
+        cached_metrics_from_cube(
+            cube, as_of=today - timedelta(days=days), use_cache=True
+        )
+
+    assert first == second == compute_metrics_from_cube(cube)
+    assert [e["status"] for e in events] == ["miss", "hit", "miss", "miss"]
+    assert events[-1]["evicted"] == 1
+    assert len(list((tmp_path / "processados" / "metricas").glob("*.json"))) == 2
@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.relatorio.agregados import CUBE_COLUMNS
+from src.relatorio.metricas import compute_metrics_from_cube, compute_weekly_metrics
+from src.relatorio.semana_epi import build_epi_calendar, epi_weeks, lookup_epi_weeks
+
+
+def _reference_epi_week(day: date):
+    # Cálculo direto da regra: SE 1 é a semana (domingo a sábado) com 4 de janeiro.
+    sunday = day - timedelta(days=(day.weekday() + 1) % 7)
+    for year in (sunday.year + 1, sunday.year, sunday.year - 1):
+        jan4 = date(year, 1, 4)
+        first = jan4 - timedelta(days=(jan4.weekday() + 1) % 7)
+        if sunday >= first:
+            return year, (sunday - first).days // 7 + 1
+
+
+@pytest.mark.parametrize(
+    "day, expected",
+    [
+        ("2020-12-31", (2020, 53)),
+        ("2021-01-02", (2020, 53)),
+        ("2021-01-03", (2021, 1)),
+        ("2022-01-01", (2021, 52)),
+        ("2023-12-31", (2024, 1)),
+        ("2024-12-29", (2025, 1)),
+    ],
+)
+def test_epi_week_known_dates(day, expected):
+    year, week = epi_weeks([day])
+    assert (int(year[0]), int(week[0])) == expected
+
+
+def test_calendar_lookup_matches_reference():
+    calendar = build_epi_calendar("2015-12-01", "2031-01-31")
+    days = pd.date_range("2016-01-01", "2030-12-31", freq="D")
+
+    year, week = lookup_epi_weeks(calendar, days)
+
+    expected = [_reference_epi_week(d.date()) for d in days]
+    assert list(zip(year.tolist(), week.tolist())) == expected
+    with pytest.raises(ValueError):
+        lookup_epi_weeks(calendar, ["2032-01-01"])
+
+
+def test_weekly_metrics_group_cube_by_epi_week():
+    as_of = pd.Timestamp("2026-03-01")  # domingo: início da SE 09/2026
+    index = pd.date_range("2026-01-01", "2026-02-28", freq="D")
+    index = index[index.day % 3 != 0]
+    rng = np.random.default_rng(0)
+    cube = pd.DataFrame(
+        {c: rng.integers(0, 5, len(index)) for c in CUBE_COLUMNS},
+        index=pd.DatetimeIndex(index, name="case_date"),
+    )
+
+    weekly = compute_weekly_metrics(cube, as_of=as_of)
+
+    assert (weekly["epi_year"].iloc[0], weekly["epi_week"].iloc[0]) == (2025, 53)
+    assert (weekly["epi_year"].iloc[-1], weekly["epi_week"].iloc[-1]) == (2026, 8)
+    assert weekly["cases"].sum() == cube["cases"].sum()
+    assert (weekly["prev_cases"].iloc[1:].to_numpy() == weekly["cases"].iloc[:-1]).all()
+
+    # Com `as_of` num domingo, a última SE é a mesma janela dos últimos 7 dias.
+    metrics = compute_metrics_from_cube(cube, as_of=as_of)
+    last = weekly.iloc[-1]
+    assert last["cases"] == metrics["last7_cases"]
+    assert last["prev_cases"] == metrics["prev7_cases"]
+    assert last["case_increase_rate"] == metrics["case_increase_rate"]